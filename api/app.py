@@ -8,20 +8,74 @@ RESTful API
 @Version: 0.0.0
 """
 
+import json
 import os
+import time
+from typing import Callable
 
-from flask import Flask, jsonify
+from flask import Flask, Response, g, jsonify, stream_with_context
 from flask_restx import Api, Namespace, Resource
 from flask_cors import CORS
 
-from db import Database, Query
+from cache import DataVersions, ResponseCache
+from compression import Compressor
+from conditional import Conditional
+from db import (
+    TILE_LAYERS,
+    Database,
+    PoolTimeout,
+    Query,
+    QueryError,
+    geojson_query,
+    tile_tables,
+)
+from instrumentation import PROMETHEUS_TYPE, server_timing, track_request
+from params import (
+    bound_params,
+    cluster_stability_parser,
+    ctu_parser,
+    current_cluster_parser,
+    incident_parser,
+    yearly_cluster_parser,
+)
+import serializer
+from snapshots import SnapshotStore, encode
+from topology import to_topojson
 
 # Set up DB Connection
 db = Database.initialize_from_env()
 
+# Set up Response Cache
+cache = ResponseCache(
+    max_bytes=int(os.environ.get("API_CACHE_MAX_BYTES", 256 * 1024 * 1024)),
+    directory=os.environ.get("API_CACHE_DIR"),
+    max_disk_bytes=int(os.environ.get("API_CACHE_DIR_MAX_BYTES", 1024 * 1024 * 1024)),
+)
+versions = DataVersions(db, ttl=float(os.environ.get("DATA_VERSION_TTL", 30)))
+
+# Set up Pre-Rendered Snapshots (Disabled Unless a Directory is Given)
+snapshot = SnapshotStore(os.environ.get("API_SNAPSHOT_DIR"), versions)
+
+# Streaming Settings
+STREAM_BATCH_SIZE = int(os.environ.get("API_STREAM_BATCH_SIZE", 1000))
+STREAM_CHUNK_BYTES = int(os.environ.get("API_STREAM_CHUNK_BYTES", 64 * 1024))
+
+# Set up Response Compression
+compressor = Compressor(
+    cache,
+    min_size=int(os.environ.get("API_COMPRESSION_MIN_BYTES", 1024)),
+    gzip_level=int(os.environ.get("API_GZIP_LEVEL", 6)),
+    brotli_quality=int(os.environ.get("API_BROTLI_QUALITY", 5)),
+)
+
+# Set up ETag & Last-Modified Validators
+conditional = Conditional(versions)
+
 # Configure API
 app = Flask(__name__)
+app.json = serializer.JSONProvider(app)
 CORS(app)
+compressor.init_app(app)
 
 api = Api(
     app,
@@ -32,6 +86,151 @@ api = Api(
     description="A RESTful API used for accessing geospatial data related to vehicle crash data in Minnesota.",
 )
 
+
+# Serialize flask-restx Output with the Same Serializer as jsonify
+@api.representation("application/json")
+def output_json(data, code: int, headers: dict = None) -> Response:
+    out = Response(serializer.dumps(data), code, mimetype="application/json")
+    out.headers.extend(headers or {})
+
+    return out
+
+
+# Query Timings
+@app.before_request
+def start_timing():
+    g.timings = track_request()
+    g.started = time.perf_counter()
+
+
+@app.after_request
+def add_server_timing(response: Response) -> Response:
+    if "timings" in g:
+        response.headers["Server-Timing"] = server_timing(
+            g.timings, time.perf_counter() - g.started
+        )
+
+    return response
+
+
+@app.route("/metrics")
+def metrics() -> Response:
+    # Prometheus Scrape Endpoint
+    return Response(db.metrics(), content_type=PROMETHEUS_TYPE)
+
+
+# Error Handling
+@api.errorhandler(PoolTimeout)
+def handle_pool_timeout(error):
+    return {"message": "Database is busy, please retry."}, 503
+
+
+@api.errorhandler(QueryError)
+def handle_query_error(error):
+    return {"message": str(error)}, 500
+
+
+# Cached Responses
+def cached_response(
+    key: str,
+    tables: list,
+    render: Callable[[], bytes],
+    params: dict = None,
+    mimetype: str = "application/json",
+) -> Response:
+    # Parameterized Responses are Cached per Set of Parameters
+    if params is not None:
+        key += "?" + json.dumps(params, sort_keys=True, default=str)
+
+    # Serve from Cache if Rendered for the Current Data Version
+    version = versions.stamp(*tables)
+    body = cache.get(key, version)
+
+    if body is None:
+        body = render()
+        cache.put(key, version, body)
+
+    return Response(body, mimetype=mimetype)
+
+
+def cached_geojson(
+    key: str, query: str, tables: list, params: dict = None, name: str = None
+) -> Response:
+    def render() -> bytes:
+        return encode(db.query(query, params, name), "text")
+
+    return cached_response(key, tables, render, params)
+
+
+# Streamed Responses
+def streamed_geojson(query: str, params: dict = None, name: str = None) -> Response:
+    def generate():
+        chunk = [b'{"type": "FeatureCollection", "features": [']
+        size = 0
+
+        # Features Arrive in Batches from a Server-Side Cursor
+        for i, row in enumerate(db.stream(query, params, STREAM_BATCH_SIZE, name)):
+            feature = (b"," if i else b"") + row[0].encode("utf-8")
+            chunk.append(feature)
+            size += len(feature)
+
+            # Flush Once Enough Features are Buffered
+            if size >= STREAM_CHUNK_BYTES:
+                yield b"".join(chunk)
+                chunk = []
+                size = 0
+
+        chunk.append(b"]}")
+        yield b"".join(chunk)
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
+
+
+# GeoJSON Responses
+def geojson_response(
+    key: str, table: str, query: str, features_query: str, args: dict
+) -> Response:
+    stream = args.pop("stream")
+    topojson = args.pop("format", None) == "topojson"
+
+    # Plain Documents Use the Fixed Queries (& Pre-Rendered Cache Entries)
+    if all(v is None for v in args.values()) and not topojson:
+        if stream:
+            return streamed_geojson(features_query)
+
+        return cached_geojson(key, query, [table])
+
+    # Build Query for the Requested Filters & Projection
+    params = bound_params(args)
+    name = f"geojson_query.{table}"
+    options = {
+        "fields": args["fields"],
+        "bbox": args.get("bbox") is not None,
+        "start": args.get("start") is not None,
+        "end": args.get("end") is not None,
+        "limit": args.get("limit") is not None,
+        "simplified": args.get("zoom") is not None,
+    }
+
+    if stream:
+        return streamed_geojson(
+            geojson_query(table, collection=False, **options), params, name
+        )
+
+    composed = geojson_query(table, **options)
+
+    if topojson:
+
+        def render() -> bytes:
+            out = db.query(composed, params, name)
+
+            return serializer.dumps(to_topojson(serializer.loads(out[0][0]), table))
+
+        return cached_response(key + "/topojson", [table], render, params)
+
+    return cached_geojson(key, composed, [table], params, name)
+
+
 # Create Namespaces
 incidents_namespace = Namespace(
     "incidents",
@@ -48,10 +247,16 @@ metrics_namespace = Namespace(
     description="Operations for accessing crash metrics",
 )
 
+tiles_namespace = Namespace(
+    "tiles",
+    description="Operations for accessing Mapbox Vector Tiles",
+)
+
 # Add Namespaces to API
 api.add_namespace(incidents_namespace)
 api.add_namespace(ctu_namespace)
 api.add_namespace(metrics_namespace)
+api.add_namespace(tiles_namespace)
 
 
 # Routes for Incidents Namespace
@@ -62,14 +267,37 @@ class Incidents(Resource):
     @incidents_namespace.doc(
         description="Retrieves the incident locations and attributes for all incidents."
     )
+    @incidents_namespace.expect(incident_parser)
+    @snapshot("incidents/geojson")
+    @conditional("geo_accidents_mn")
     def get(self):
+        # Query & Return
+        return geojson_response(
+            "incidents/geojson",
+            "geo_accidents_mn",
+            Query.INCIDENT_GEOJSON,
+            Query.INCIDENT_FEATURES,
+            incident_parser.parse_args(),
+        )
+
+
+@incidents_namespace.route(
+    "/<int:icr>",
+)
+class Incident(Resource):
+    @incidents_namespace.doc(
+        description="Retrieves the location and attributes of a single incident by ICR."
+    )
+    @conditional("geo_accidents_mn")
+    def get(self, icr):
         # Query
-        db.connect()
-        out = db.query(Query.INCIDENT_GEOJSON)[0][0]
-        db.close()
+        out = db.query(Query.INCIDENT_ICR, {"icr": icr})
+
+        if not out:
+            incidents_namespace.abort(404, f"Incident {icr} not found")
 
         # Return
-        return out
+        return Response(encode(out, "text"), mimetype="application/json")
 
 
 @incidents_namespace.route(
@@ -79,11 +307,11 @@ class IncidentTotal(Resource):
     @incidents_namespace.doc(
         description="Retrieves the total number of incidents all-time."
     )
+    @snapshot("incidents/total")
+    @conditional("raw_accidents")
     def get(self):
         # Query
-        db.connect()
         out = db.query(Query.INCIDENT_TOTAL)[0][0]
-        db.close()
 
         # Return
         return out
@@ -96,11 +324,11 @@ class IncidentsLastWeek(Resource):
     @incidents_namespace.doc(
         description="Retrieves the number of incidents in the past week."
     )
+    @snapshot("incidents/last-week")
+    @conditional("glb_wk_time_series")
     def get(self):
         # Query
-        db.connect()
         out = db.query(Query.INCIDENT_LAST_WEEK)[0][0]
-        db.close()
 
         # Return
         return out
@@ -113,14 +341,18 @@ class CurrentClusters(Resource):
     @incidents_namespace.doc(
         description="Retrieves footprints based on current all-time clustering analysis."
     )
+    @incidents_namespace.expect(current_cluster_parser)
+    @snapshot("incidents/crnt-clstr-ftprnt")
+    @conditional("crnt_clstr_ftprnt")
     def get(self):
-        # Query
-        db.connect()
-        out = db.query(Query.INCIDENT_CURRENT_CLUSTERS)[0][0]
-        db.close()
-
-        # Return
-        return out
+        # Query & Return
+        return geojson_response(
+            "incidents/crnt-clstr-ftprnt",
+            "crnt_clstr_ftprnt",
+            Query.INCIDENT_CURRENT_CLUSTERS,
+            Query.INCIDENT_CURRENT_CLUSTER_FEATURES,
+            current_cluster_parser.parse_args(),
+        )
 
 
 @incidents_namespace.route(
@@ -130,14 +362,18 @@ class YearlyClusters(Resource):
     @incidents_namespace.doc(
         description="Retrieves footprints for each year of the analysis."
     )
+    @incidents_namespace.expect(yearly_cluster_parser)
+    @snapshot("incidents/yrly-clstr-ftprnt")
+    @conditional("clstr_ts_ftprnt")
     def get(self):
-        # Query
-        db.connect()
-        out = db.query(Query.INCIDENT_YEARLY_CLUSTERS)[0][0]
-        db.close()
-
-        # Return
-        return out
+        # Query & Return
+        return geojson_response(
+            "incidents/yrly-clstr-ftprnt",
+            "clstr_ts_ftprnt",
+            Query.INCIDENT_YEARLY_CLUSTERS,
+            Query.INCIDENT_YEARLY_CLUSTER_FEATURES,
+            yearly_cluster_parser.parse_args(),
+        )
 
 
 @incidents_namespace.route(
@@ -147,14 +383,18 @@ class ClusterStability(Resource):
     @incidents_namespace.doc(
         description="Retrieves footprints from the cluster stability analysis."
     )
+    @incidents_namespace.expect(cluster_stability_parser)
+    @snapshot("incidents/clstr-ftprnt-stblty")
+    @conditional("clstr_union_ftprnt")
     def get(self):
-        # Query
-        db.connect()
-        out = db.query(Query.INCIDENT_CLUSTER_STABILITY)[0][0]
-        db.close()
-
-        # Return
-        return out
+        # Query & Return
+        return geojson_response(
+            "incidents/clstr-ftprnt-stblty",
+            "clstr_union_ftprnt",
+            Query.INCIDENT_CLUSTER_STABILITY,
+            Query.INCIDENT_CLUSTER_STABILITY_FEATURES,
+            cluster_stability_parser.parse_args(),
+        )
 
 
 # Routes for CTU Namespace
@@ -165,14 +405,18 @@ class CTUs(Resource):
     @ctu_namespace.doc(
         description="Retrieves city, township, and unorganized territory boundaries and analysis results."
     )
+    @ctu_namespace.expect(ctu_parser)
+    @snapshot("ctu/geojson")
+    @conditional("ctu_accidents")
     def get(self):
-        # Query
-        db.connect()
-        out = db.query(Query.CTU_GEOJSON)[0][0]
-        db.close()
-
-        # Return
-        return out
+        # Query & Return
+        return geojson_response(
+            "ctu/geojson",
+            "ctu_accidents",
+            Query.CTU_GEOJSON,
+            Query.CTU_FEATURES,
+            ctu_parser.parse_args(),
+        )
 
 
 # Routes for Metrics Namespace
@@ -183,11 +427,11 @@ class Alcohol(Resource):
     @metrics_namespace.doc(
         description="Retrieves the number of drivers based on whether alcohol was present or not."
     )
+    @snapshot("metrics/alcohol")
+    @conditional("metric_rollups")
     def get(self):
         # Query
-        db.connect()
         out = db.query(Query.METRICS_ALCOHOL)
-        db.close()
 
         # Return
         return jsonify(out)
@@ -200,11 +444,11 @@ class Seatbelt(Resource):
     @metrics_namespace.doc(
         description="Retrieves the number of people based on whether seatbelts were used or not."
     )
+    @snapshot("metrics/seatbelt")
+    @conditional("metric_rollups")
     def get(self):
         # Query
-        db.connect()
         out = db.query(Query.METRICS_SEATBELT)
-        db.close()
 
         # Return
         return jsonify(out)
@@ -217,11 +461,11 @@ class Helmet(Resource):
     @metrics_namespace.doc(
         description="Retrieves the number of people based on whether helmets were used or not."
     )
+    @snapshot("metrics/helmet")
+    @conditional("metric_rollups")
     def get(self):
         # Query
-        db.connect()
         out = db.query(Query.METRICS_HELMET)
-        db.close()
 
         # Return
         return jsonify(out)
@@ -234,11 +478,11 @@ class Condition(Resource):
     @metrics_namespace.doc(
         description="Retrieves the number of incidents based on the road conditions."
     )
+    @snapshot("metrics/condition")
+    @conditional("metric_rollups")
     def get(self):
         # Query
-        db.connect()
         out = db.query(Query.METRICS_CONDITION)
-        db.close()
 
         # Return
         return jsonify(out)
@@ -251,11 +495,11 @@ class AccidentType(Resource):
     @metrics_namespace.doc(
         description="Retrieves the number of incidents based on the type of incident."
     )
+    @snapshot("metrics/accident-type")
+    @conditional("metric_rollups")
     def get(self):
         # Query
-        db.connect()
         out = db.query(Query.METRICS_TYPE)
-        db.close()
 
         # Return
         return jsonify(out)
@@ -268,11 +512,11 @@ class TimeSeries(Resource):
     @metrics_namespace.doc(
         description="Retrieves the time series of incidents for each week."
     )
+    @snapshot("metrics/timeseries")
+    @conditional("glb_wk_time_series")
     def get(self):
         # Query
-        db.connect()
         out = db.query(Query.METRICS_TIMESERIES)
-        db.close()
 
         # Return
         return jsonify(out)
@@ -285,19 +529,73 @@ class VehicleCount(Resource):
     @metrics_namespace.doc(
         description="Retrieves the number of incidents based on the number of vehicles involved."
     )
+    @snapshot("metrics/vehicle-count")
+    @conditional("metric_rollups")
     def get(self):
         # Query
-        db.connect()
         out = db.query(Query.METRICS_VEHICLE_COUNT)
-        db.close()
 
         # Return
         return jsonify(out)
 
 
-if __name__ == "__main__":
-    # Development
-    # app.run(debug=True)
+@metrics_namespace.route(
+    "/summary",
+)
+class Summary(Resource):
+    @metrics_namespace.doc(
+        description="Retrieves every metric (alcohol, seatbelt, helmet, condition, accident-type, vehicle-count, timeseries) in one document."
+    )
+    @snapshot("metrics/summary")
+    @conditional("metric_rollups", "glb_wk_time_series")
+    def get(self):
+        def render() -> bytes:
+            return encode(db.query(Query.METRICS_SUMMARY), "text")
+
+        # Query & Return
+        return cached_response(
+            "metrics/summary",
+            ["metric_rollups", "glb_wk_time_series"],
+            render,
+        )
 
-    # Production
+
+# Routes for Tiles Namespace
+@tiles_namespace.route(
+    "/<string:layer>/<int:z>/<int:x>/<int:y>.pbf",
+)
+class Tiles(Resource):
+    @tiles_namespace.doc(
+        description="Retrieves a Mapbox Vector Tile of incidents, CTUs, or cluster footprints.",
+        params={"layer": "One of: " + ", ".join(TILE_LAYERS)},
+    )
+    @conditional(tile_tables)
+    def get(self, layer, z, x, y):
+        # Validate Tile
+        if layer not in TILE_LAYERS:
+            tiles_namespace.abort(404, f"Unknown layer '{layer}'")
+
+        if z > 22 or x >= 2**z or y >= 2**z:
+            tiles_namespace.abort(404, "Tile is outside the tile grid")
+
+        query, table = TILE_LAYERS[layer]
+        params = {"z": z, "x": x, "y": y}
+
+        def render() -> bytes:
+            out = db.query(query, params)
+
+            return bytes(out[0][0] or b"")
+
+        # Query & Return
+        return cached_response(
+            f"tiles/{layer}",
+            [table],
+            render,
+            params,
+            mimetype="application/vnd.mapbox-vector-tile",
+        )
+
+
+if __name__ == "__main__":
+    # Development (Production is Served by server.py)
     app.run(debug=True, host="0.0.0.0", port=int(os.environ.get("PORT", 8080)))
@@ -0,0 +1,548 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Async RESTful API (ASGI)
+
+Serves the incidents, ctu, metrics & tiles namespaces of `app.py` on asyncio,
+so one process keeps serving clients while queries are in flight:
+
+    uvicorn asgi:app --host 0.0.0.0 --port 8080
+
+@Author: Luke Zaruba
+@Date: Oct 18, 2026
+@Version: 0.0.0
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import os
+import time
+import zlib
+from typing import AsyncIterator, Awaitable, Callable
+
+import psycopg
+from psycopg import sql
+from psycopg_pool import PoolTimeout
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse, Response
+from starlette.responses import StreamingResponse
+from starlette.routing import Mount, Route
+from werkzeug.http import parse_accept_header, parse_date, parse_etags
+
+from async_db import AsyncDatabase
+from cache import DataVersions, ResponseCache
+from compression import Compressor, brotli
+from conditional import Conditional
+from db import TILE_LAYERS, Query, QueryError, geojson_query, tile_tables
+from instrumentation import PROMETHEUS_TYPE, server_timing, track_request
+from params import (
+    ParamError,
+    bound_params,
+    cluster_stability_parser,
+    ctu_parser,
+    current_cluster_parser,
+    incident_parser,
+    parse_args,
+    yearly_cluster_parser,
+)
+import serializer
+from snapshots import SNAPSHOTS, SnapshotStore, encode
+from topology import to_topojson
+
+
+class AsyncDataVersions(DataVersions):
+    """
+    `DataVersions` read through the async pool.
+
+    Call `update` (once per request) before reading stamps; `stamp` and
+    `last_modified` then never touch the database.
+    """
+
+    async def update(self) -> None:
+        if not self._due():
+            return
+
+        # Keep Previous Versions if the Lookup Fails (Including Pool Timeouts
+        # & Lost Connections, which Would Otherwise Fail Every Route)
+        try:
+            out = await self.db.query(Query.DATA_VERSIONS)
+        except (QueryError, psycopg.Error):
+            return
+
+        self._versions = {row.table_name: (row.version, row.updated_at) for row in out}
+
+    def _current(self) -> dict:
+        return self._versions
+
+
+# Set up DB Connection
+db = AsyncDatabase.initialize_from_env()
+
+# Set up Response Cache
+cache = ResponseCache(
+    max_bytes=int(os.environ.get("API_CACHE_MAX_BYTES", 256 * 1024 * 1024)),
+    directory=os.environ.get("API_CACHE_DIR"),
+    max_disk_bytes=int(os.environ.get("API_CACHE_DIR_MAX_BYTES", 1024 * 1024 * 1024)),
+)
+versions = AsyncDataVersions(db, ttl=float(os.environ.get("DATA_VERSION_TTL", 30)))
+
+# Set up Pre-Rendered Snapshots (Disabled Unless a Directory is Given)
+snapshot = SnapshotStore(os.environ.get("API_SNAPSHOT_DIR"), versions)
+
+# Streaming Settings
+STREAM_BATCH_SIZE = int(os.environ.get("API_STREAM_BATCH_SIZE", 1000))
+STREAM_CHUNK_BYTES = int(os.environ.get("API_STREAM_CHUNK_BYTES", 64 * 1024))
+
+# Set up Response Compression
+compressor = Compressor(
+    cache,
+    min_size=int(os.environ.get("API_COMPRESSION_MIN_BYTES", 1024)),
+    gzip_level=int(os.environ.get("API_GZIP_LEVEL", 6)),
+    brotli_quality=int(os.environ.get("API_BROTLI_QUALITY", 5)),
+)
+
+
+class ServerTiming:
+    """
+    ASGI middleware adding a `Server-Timing` header with the time each
+    request spent connecting to, executing & fetching from the database.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings = track_request()
+        started = time.perf_counter()
+
+        async def send_with_timing(message) -> None:
+            if message["type"] == "http.response.start":
+                header = server_timing(timings, time.perf_counter() - started)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", header.encode("latin-1"))
+                ]
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+# Error Handling
+async def handle_pool_timeout(request: Request, error: PoolTimeout) -> Response:
+    return JSONResponse({"message": "Database is busy, please retry."}, 503)
+
+
+async def handle_query_error(request: Request, error: QueryError) -> Response:
+    return JSONResponse({"message": str(error)}, 500)
+
+
+async def handle_param_error(request: Request, error: ParamError) -> Response:
+    return JSONResponse({"errors": error.errors, "message": str(error)}, 400)
+
+
+# Compressed Responses
+async def _compress_stream(
+    chunks: AsyncIterator[bytes], encoding: str
+) -> AsyncIterator[bytes]:
+    if encoding == "br":
+        stream = brotli.Compressor(quality=compressor.brotli_quality)
+        process, finish = stream.process, stream.finish
+    else:
+        # wbits=31 Writes a Gzip Header & Trailer
+        stream = zlib.compressobj(compressor.gzip_level, zlib.DEFLATED, 31)
+        process, finish = stream.compress, stream.flush
+
+    async for chunk in chunks:
+        yield process(chunk)
+
+    yield finish()
+
+
+def compress_response(request: Request, response: Response) -> Response:
+    response.headers["Vary"] = "Accept-Encoding"
+
+    encoding = compressor.negotiate(
+        parse_accept_header(request.headers.get("Accept-Encoding"))
+    )
+
+    if encoding is None:
+        return response
+
+    etag = response.headers.get("ETag")
+
+    # Compress Streams Chunk by Chunk
+    if isinstance(response, StreamingResponse):
+        response.body_iterator = _compress_stream(response.body_iterator, encoding)
+    elif len(response.body) >= compressor.min_size:
+        response.body = compressor.compress_cached(response.body, encoding, etag)
+        response.headers["Content-Length"] = str(len(response.body))
+    else:
+        return response
+
+    response.headers["Content-Encoding"] = encoding
+
+    # Each Encoding is its Own Representation with its Own Strong ETag
+    if etag is not None:
+        response.headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+
+    return response
+
+
+# Snapshots & Validators
+def serve_snapshot(request: Request, name: str) -> Response:
+    accept_encodings = parse_accept_header(request.headers.get("Accept-Encoding"))
+    selected = snapshot.select(name, lambda enc: bool(accept_encodings[enc]))
+
+    if selected is None:
+        return None
+
+    etag, encoding, path = selected
+
+    if parse_etags(request.headers.get("If-None-Match")).contains(etag):
+        out = Response(status_code=304)
+    else:
+        if not os.path.exists(path):
+            return None
+
+        out = FileResponse(path, media_type="application/json")
+
+        if encoding != "identity":
+            out.headers["Content-Encoding"] = encoding
+
+    out.headers["ETag"] = f'"{etag}"'
+    out.headers["Cache-Control"] = "no-cache"
+    out.headers["Vary"] = "Accept-Encoding"
+
+    return out
+
+
+def endpoint(name: str, *tables) -> Callable:
+    """Serves a route from its snapshot, with ETag validators & compression.
+
+    The async counterpart of stacking `@snapshot(name)` & `@conditional(*tables)`
+    on a Flask route; pass `name=None` for routes without a snapshot. As with
+    `@conditional`, `tables` may be a single function of the path parameters.
+    """
+
+    def decorator(func: Callable[..., Awaitable[Response]]) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(request: Request) -> Response:
+            await versions.update()
+
+            if name is not None and snapshot.directory and not request.query_params:
+                out = serve_snapshot(request, name)
+
+                if out is not None:
+                    return out
+
+            read = tables[0](**request.path_params) if callable(tables[0]) else tables
+
+            etag = Conditional.etag(
+                request.url.path,
+                request.query_params.multi_items(),
+                versions.stamp(*read),
+            )
+            last_modified = versions.last_modified(*read)
+
+            # Answer Conditional Requests Without Running the Route
+            cached_etag = Conditional.not_modified(
+                etag,
+                last_modified,
+                parse_etags(request.headers.get("If-None-Match")),
+                parse_date(request.headers.get("If-Modified-Since")),
+            )
+
+            if cached_etag is not None:
+                out = Response(status_code=304)
+                Conditional.set_validators(out.headers, cached_etag, last_modified)
+
+                return out
+
+            out = await func(request)
+
+            if out.status_code != 200:
+                return out
+
+            Conditional.set_validators(out.headers, etag, last_modified)
+
+            return compress_response(request, out)
+
+        return wrapper
+
+    return decorator
+
+
+# Cached Responses
+async def cached_response(
+    key: str,
+    tables: list,
+    render: Callable[[], Awaitable[bytes]],
+    params: dict = None,
+    media_type: str = "application/json",
+) -> Response:
+    # Parameterized Responses are Cached per Set of Parameters
+    if params is not None:
+        key += "?" + json.dumps(params, sort_keys=True, default=str)
+
+    # Serve from Cache if Rendered for the Current Data Version
+    version = versions.stamp(*tables)
+    body = cache.get(key, version)
+
+    if body is None:
+        body = await render()
+        cache.put(key, version, body)
+
+    return Response(body, media_type=media_type)
+
+
+async def cached_geojson(
+    key: str, query: str, tables: list, params: dict = None, name: str = None
+) -> Response:
+    async def render() -> bytes:
+        return encode(await db.query(query, params, name), "text")
+
+    return await cached_response(key, tables, render, params)
+
+
+# Streamed Responses
+def streamed_geojson(query: str, params: dict = None, name: str = None) -> Response:
+    async def generate():
+        chunk = [b'{"type": "FeatureCollection", "features": [']
+        size = 0
+        i = 0
+
+        # Features Arrive in Batches from a Server-Side Cursor
+        async for row in db.stream(query, params, STREAM_BATCH_SIZE, name):
+            feature = (b"," if i else b"") + row[0].encode("utf-8")
+            chunk.append(feature)
+            size += len(feature)
+            i += 1
+
+            # Flush Once Enough Features are Buffered
+            if size >= STREAM_CHUNK_BYTES:
+                yield b"".join(chunk)
+                chunk = []
+                size = 0
+
+        chunk.append(b"]}")
+        yield b"".join(chunk)
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+
+# GeoJSON Responses
+async def geojson_response(
+    key: str, table: str, query: str, features_query: str, args: dict
+) -> Response:
+    stream = args.pop("stream")
+    topojson = args.pop("format", None) == "topojson"
+
+    # Plain Documents Use the Fixed Queries (& Pre-Rendered Cache Entries)
+    if all(v is None for v in args.values()) and not topojson:
+        if stream:
+            return streamed_geojson(features_query)
+
+        return await cached_geojson(key, query, [table])
+
+    # Build Query for the Requested Filters & Projection
+    params = bound_params(args)
+    name = f"geojson_query.{table}"
+    options = {
+        "fields": args["fields"],
+        "bbox": args.get("bbox") is not None,
+        "start": args.get("start") is not None,
+        "end": args.get("end") is not None,
+        "limit": args.get("limit") is not None,
+        "simplified": args.get("zoom") is not None,
+        "composer": sql,
+    }
+
+    if stream:
+        return streamed_geojson(
+            geojson_query(table, collection=False, **options), params, name
+        )
+
+    composed = geojson_query(table, **options)
+
+    if topojson:
+
+        async def render() -> bytes:
+            out = await db.query(composed, params, name)
+
+            # Encoding is CPU Bound, Keep it off the Event Loop
+            topology = await run_in_threadpool(
+                to_topojson, serializer.loads(out[0][0]), table
+            )
+
+            return serializer.dumps(topology)
+
+        return await cached_response(key + "/topojson", [table], render, params)
+
+    return await cached_geojson(key, composed, [table], params, name)
+
+
+def geojson_route(name: str, table: str, query: str, features_query: str, parser):
+    @endpoint(name, table)
+    async def get(request: Request) -> Response:
+        # Query & Return
+        return await geojson_response(
+            name, table, query, features_query, parse_args(parser, request.query_params)
+        )
+
+    return Route(f"/{name}", get, methods=["GET"])
+
+
+def document_route(name: str, *tables: str):
+    # Same Query & Encoding as the Route's Snapshot
+    query, shape, _ = SNAPSHOTS[name]
+
+    @endpoint(name, *tables)
+    async def get(request: Request) -> Response:
+        async def render() -> bytes:
+            return encode(await db.query(query), shape)
+
+        # Query & Return
+        return await cached_response(name, list(tables), render)
+
+    return Route(f"/{name}", get, methods=["GET"])
+
+
+async def metrics(request: Request) -> Response:
+    # Prometheus Scrape Endpoint
+    return Response(db.metrics(), media_type=PROMETHEUS_TYPE)
+
+
+@endpoint(None, "geo_accidents_mn")
+async def incident(request: Request) -> Response:
+    icr = request.path_params["icr"]
+
+    # Query
+    out = await db.query(Query.INCIDENT_ICR, {"icr": icr})
+
+    if not out:
+        return JSONResponse({"message": f"Incident {icr} not found"}, 404)
+
+    # Return
+    return Response(encode(out, "text"), media_type="application/json")
+
+
+@endpoint(None, tile_tables)
+async def tile(request: Request) -> Response:
+    layer = request.path_params["layer"]
+    z, x, y = (request.path_params[k] for k in ("z", "x", "y"))
+
+    # Validate Tile
+    if layer not in TILE_LAYERS:
+        return JSONResponse({"message": f"Unknown layer '{layer}'"}, 404)
+
+    if z > 22 or x >= 2**z or y >= 2**z:
+        return JSONResponse({"message": "Tile is outside the tile grid"}, 404)
+
+    query, table = TILE_LAYERS[layer]
+    params = {"z": z, "x": x, "y": y}
+
+    async def render() -> bytes:
+        out = await db.query(query, params)
+
+        return bytes(out[0][0] or b"")
+
+    # Query & Return
+    return await cached_response(
+        f"tiles/{layer}",
+        [table],
+        render,
+        params,
+        media_type="application/vnd.mapbox-vector-tile",
+    )
+
+
+routes = [
+    # Incidents Namespace
+    geojson_route(
+        "incidents/geojson",
+        "geo_accidents_mn",
+        Query.INCIDENT_GEOJSON,
+        Query.INCIDENT_FEATURES,
+        incident_parser,
+    ),
+    Route("/incidents/{icr:int}", incident, methods=["GET"]),
+    document_route("incidents/total", "raw_accidents"),
+    document_route("incidents/last-week", "glb_wk_time_series"),
+    geojson_route(
+        "incidents/crnt-clstr-ftprnt",
+        "crnt_clstr_ftprnt",
+        Query.INCIDENT_CURRENT_CLUSTERS,
+        Query.INCIDENT_CURRENT_CLUSTER_FEATURES,
+        current_cluster_parser,
+    ),
+    geojson_route(
+        "incidents/yrly-clstr-ftprnt",
+        "clstr_ts_ftprnt",
+        Query.INCIDENT_YEARLY_CLUSTERS,
+        Query.INCIDENT_YEARLY_CLUSTER_FEATURES,
+        yearly_cluster_parser,
+    ),
+    geojson_route(
+        "incidents/clstr-ftprnt-stblty",
+        "clstr_union_ftprnt",
+        Query.INCIDENT_CLUSTER_STABILITY,
+        Query.INCIDENT_CLUSTER_STABILITY_FEATURES,
+        cluster_stability_parser,
+    ),
+    # CTU Namespace
+    geojson_route(
+        "ctu/geojson",
+        "ctu_accidents",
+        Query.CTU_GEOJSON,
+        Query.CTU_FEATURES,
+        ctu_parser,
+    ),
+    # Metrics Namespace
+    document_route("metrics/alcohol", "metric_rollups"),
+    document_route("metrics/seatbelt", "metric_rollups"),
+    document_route("metrics/helmet", "metric_rollups"),
+    document_route("metrics/condition", "metric_rollups"),
+    document_route("metrics/accident-type", "metric_rollups"),
+    document_route("metrics/timeseries", "glb_wk_time_series"),
+    document_route("metrics/vehicle-count", "metric_rollups"),
+    document_route("metrics/summary", "metric_rollups", "glb_wk_time_series"),
+    # Tiles Namespace
+    Route("/tiles/{layer}/{z:int}/{x:int}/{y:int}.pbf", tile, methods=["GET"]),
+]
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: Starlette) -> AsyncIterator:
+    # Open Pool Inside the Event Loop, Close it on Shutdown
+    await db.connect()
+    yield
+    await db.close()
+
+
+# Configure API
+app = Starlette(
+    routes=[
+        Mount("/api/v1", routes=routes),
+        Route("/metrics", metrics, methods=["GET"]),
+    ],
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=["*"]),
+        Middleware(ServerTiming),
+    ],
+    exception_handlers={
+        PoolTimeout: handle_pool_timeout,
+        QueryError: handle_query_error,
+        ParamError: handle_param_error,
+    },
+    lifespan=lifespan,
+)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Async database handling for the ASGI API
+
+@Author: Luke Zaruba
+@Date: Oct 18, 2026
+@Version: 0.0.0
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import time
+from typing import AsyncIterator
+
+import psycopg
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+
+from db import QueryError, ReadRouter, Statement, query_name, split_host
+from instrumentation import QueryStats, replica_gauge, row_size
+
+
+class AsyncDatabase:
+    """
+    The async counterpart of `db.Database`, backed by psycopg 3.
+
+    Queries use the same `%(name)s` placeholders as psycopg2, so the queries
+    in `db.Query` run unchanged, prepared by psycopg on first use per
+    connection.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        user: str,
+        password: str,
+        db_name: str,
+        port: int,
+        min_connections: int = 1,
+        max_connections: int = 10,
+        timeout: float = 30.0,
+        read_hosts: list = None,
+        connect_timeout: int = 5,
+        retry_after: float = 30.0,
+    ) -> None:
+        self.host = host
+        self.user = user
+        self.password = password
+        self.db_name = db_name
+        self.port = port
+
+        # Pool Settings
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+
+        # Read Replicas (`host[:port]`), Used Before the Primary
+        self.router = ReadRouter(read_hosts or [], retry_after)
+
+        # Query Timings, Row Counts & Sizes
+        self.stats = QueryStats()
+
+        # Pools are Opened by `connect`, Inside the Event Loop
+        self.pool = None
+        self.read_pools = {}
+
+    @classmethod
+    def initialize_from_env(cls) -> AsyncDatabase:
+        # Extract Secrets
+        host = os.environ.get("DB_HOST")
+        user = os.environ.get("DB_USER")
+        password = os.environ.get("DB_PASSWORD")
+        db_name = os.environ.get("DB_NAME")
+        port = os.environ.get("DB_PORT")
+
+        # Extract Pool Settings
+        min_connections = int(os.environ.get("DB_POOL_MIN", 1))
+        max_connections = int(os.environ.get("DB_POOL_MAX", 10))
+        timeout = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+
+        # Extract Read Replicas, e.g. "replica-1,replica-2:5433"
+        read_hosts = [h.strip() for h in os.environ.get("DB_READ_HOSTS", "").split(",")]
+        connect_timeout = int(os.environ.get("DB_CONNECT_TIMEOUT", 5))
+        retry_after = float(os.environ.get("DB_READ_RETRY_AFTER", 30))
+
+        # Return Instance
+        return cls(
+            host,
+            user,
+            password,
+            db_name,
+            port,
+            min_connections=min_connections,
+            max_connections=max_connections,
+            timeout=timeout,
+            read_hosts=[h for h in read_hosts if h],
+            connect_timeout=connect_timeout,
+            retry_after=retry_after,
+        )
+
+    async def connect(self) -> None:
+        if self.pool is None:
+            self.pool = self._new_pool(self.host, self.port, self.timeout)
+            await self.pool.open()
+
+            # Replica Pools Connect in the Background, Failures are Routed Around
+            for replica in self.router.replicas:
+                host, port = split_host(replica, self.port)
+                pool = self._new_pool(
+                    host, port, min(self.timeout, self.connect_timeout)
+                )
+                await pool.open()
+                self.read_pools[replica] = pool
+
+    def _new_pool(self, host: str, port: int, timeout: float) -> AsyncConnectionPool:
+        return AsyncConnectionPool(
+            make_conninfo(
+                host=host,
+                dbname=self.db_name,
+                user=self.user,
+                password=self.password,
+                port=port,
+                connect_timeout=self.connect_timeout,
+            ),
+            min_size=self.min_connections,
+            max_size=self.max_connections,
+            timeout=timeout,
+            configure=self._configure,
+            open=False,
+        )
+
+    @contextlib.asynccontextmanager
+    async def _connection(self) -> AsyncIterator:
+        # Replicas First, Falling Back to the Primary
+        for replica in self.router.candidates():
+            pool = self.pool if replica is None else self.read_pools[replica]
+
+            try:
+                connection = await pool.getconn()
+
+                # Back in Rotation Once a Connection Succeeds Again
+                if replica is not None:
+                    self.router.mark_up(replica)
+
+                break
+
+            except (PoolTimeout, psycopg.OperationalError):
+                if replica is None:
+                    raise
+
+                # The Pool Retries Failed Connections in the Background, so an
+                # Unreachable Replica Surfaces as a Timeout
+                self.router.mark_down(replica)
+
+        try:
+            yield connection
+
+        finally:
+            if connection.closed and replica is not None:
+                self.router.mark_down(replica)
+
+            await pool.putconn(connection)
+
+    @staticmethod
+    async def _configure(connection: psycopg.AsyncConnection) -> None:
+        # The API Only Reads; Statements Run Read Only Without BEGIN/COMMIT
+        await connection.set_autocommit(True)
+        await connection.execute("SET default_transaction_read_only = on")
+
+    async def query(self, query: str, params: dict = None, name: str = None) -> list:
+        name = name or query_name(query)
+
+        # Open Pool on First Use
+        if self.pool is None:
+            await self.connect()
+
+        start = time.perf_counter()
+
+        # Borrow Connection from a Replica or the Primary
+        async with self._connection() as connection:
+            self.stats.observe(name, "connect", time.perf_counter() - start)
+
+            async with connection.cursor() as c:
+                try:
+                    start = time.perf_counter()
+
+                    # Statements are Prepared on First Use per Connection
+                    if isinstance(query, Statement):
+                        await c.execute(query.text, params, prepare=True)
+                    else:
+                        await c.execute(query, params)
+
+                    self.stats.observe(name, "execute", time.perf_counter() - start)
+
+                    start = time.perf_counter()
+                    out = await c.fetchall()
+                    self.stats.observe(name, "fetch", time.perf_counter() - start)
+                    self.stats.record_result(name, out)
+
+                except psycopg.Error as e:
+                    self.stats.record_error(name)
+
+                    # Surface Error
+                    raise QueryError("Error: " + str(e)) from e
+
+        if isinstance(query, Statement):
+            return query.decode(out)
+
+        return out
+
+    async def stream(
+        self,
+        query: str,
+        params: dict = None,
+        batch_size: int = 1000,
+        name: str = None,
+    ) -> AsyncIterator:
+        name = name or query_name(query)
+
+        # Open Pool on First Use
+        if self.pool is None:
+            await self.connect()
+
+        start = time.perf_counter()
+
+        # DECLARE Can't Run a Prepared Statement, so Streams Send the Text
+        decode = None
+
+        if isinstance(query, Statement):
+            query, decode = query.text, query.row
+
+        # Borrow Connection for the Lifetime of the Stream
+        async with self._connection() as connection:
+            self.stats.observe(name, "connect", time.perf_counter() - start)
+
+            # Named Cursors Keep Results on the Server & Fetch in Batches, and
+            # Need a Transaction
+            async with connection.transaction(), connection.cursor(name="stream") as c:
+                c.itersize = batch_size
+
+                try:
+                    start = time.perf_counter()
+                    await c.execute(query, params)
+                    self.stats.observe(name, "execute", time.perf_counter() - start)
+
+                    # Time Spent Fetching, Excluding Time Spent by the Consumer
+                    fetch, count, size = 0.0, 0, 0
+
+                    while True:
+                        start = time.perf_counter()
+                        batch = await c.fetchmany(batch_size)
+                        fetch += time.perf_counter() - start
+
+                        if not batch:
+                            break
+
+                        for row in batch:
+                            count += 1
+                            size += row_size(row)
+
+                            yield decode(*row) if decode else row
+
+                    self.stats.observe(name, "fetch", fetch)
+                    self.stats.record_rows(name, count, size)
+
+                except psycopg.Error as e:
+                    self.stats.record_error(name)
+
+                    # Surface Error
+                    raise QueryError("Error: " + str(e)) from e
+
+    def metrics(self) -> str:
+        """Query timings & replica status in the Prometheus text format."""
+        return self.stats.render() + replica_gauge(self.router.status())
+
+    async def close(self) -> None:
+        # Close Pooled Connections
+        if self.pool is not None:
+            await self.pool.close()
+
+        for pool in self.read_pools.values():
+            await pool.close()
+
+        # Set Pools to None
+        self.pool = None
+        self.read_pools = {}
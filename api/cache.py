@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Response caching for RESTful API
+
+@Author: Luke Zaruba
+@Date: Oct 18, 2026
+@Version: 0.0.0
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import psycopg2
+
+from db import Database, Query, QueryError
+
+
+class ResponseCache:
+    """
+    An LRU cache of serialized responses, bounded by total size in bytes.
+
+    Each entry remembers the data version it was rendered from and is treated
+    as a miss once the version moves on. When `directory` is set, entries are
+    also written to disk so they survive restarts and are shared by workers;
+    the least recently used files are removed once the directory holds more
+    than `max_disk_bytes` (by default, `max_bytes`).
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        directory: str = None,
+        max_disk_bytes: int = None,
+    ):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_bytes if max_disk_bytes is None else max_disk_bytes
+
+        # Key -> (Version, Body), Least Recently Used First
+        self._entries = OrderedDict()
+        self._size = 0
+        self._disk_size = 0
+        self._lock = threading.Lock()
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self._prune_files()
+
+    def get(self, key: str, version: str) -> bytes:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                if entry[0] == version:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+
+                # Stale Entry
+                self._remove(key)
+
+        # Fall Back to Disk
+        if self.directory:
+            body = self._read_file(key, version)
+
+            if body is not None:
+                self._store(key, version, body)
+                return body
+
+        return None
+
+    def put(self, key: str, version: str, body: bytes) -> None:
+        self._store(key, version, body)
+
+        if self.directory:
+            self._write_file(key, version, body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _store(self, key: str, version: str, body: bytes) -> None:
+        # Entries Larger than the Whole Cache are Never Kept
+        if len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (version, body)
+            self._size += len(body)
+
+            # Evict Least Recently Used Entries
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _remove(self, key: str) -> None:
+        _, body = self._entries.pop(key)
+        self._size -= len(body)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+        return os.path.join(self.directory, digest)
+
+    def _read_file(self, key: str, version: str) -> bytes:
+        path = self._path(key)
+
+        try:
+            with open(path, "rb") as f:
+                # First Line Holds the Version
+                stored_version = f.readline().rstrip(b"\n").decode("utf-8")
+
+                if stored_version != version:
+                    return None
+
+                body = f.read()
+
+            # Modification Time Tracks Use, for Pruning
+            os.utime(path)
+
+            return body
+
+        except OSError:
+            return None
+
+    def _write_file(self, key: str, version: str, body: bytes) -> None:
+        # Write to Temp File & Rename so Readers Never See Partial Entries
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(version.encode("utf-8") + b"\n")
+                f.write(body)
+
+            os.replace(tmp_path, self._path(key))
+
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+            return
+
+        with self._lock:
+            self._disk_size += len(version) + 1 + len(body)
+            full = self._disk_size > self.max_disk_bytes
+
+        if full:
+            self._prune_files()
+
+    def _prune_files(self) -> None:
+        # Sizes are Re-Read from Disk, as Other Workers Write Here Too
+        files = []
+
+        for entry in os.scandir(self.directory):
+            # Skip Temp Files Still Being Written
+            if len(entry.name) != 64:
+                continue
+
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size = sum(file_size for _, file_size, _ in files)
+
+        # Remove Least Recently Used Files
+        for _, file_size, path in sorted(files):
+            if size <= self.max_disk_bytes:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+            size -= file_size
+
+        with self._lock:
+            self._disk_size = size
+
+
+class DataVersions:
+    """
+    Tracks the version stamps the pipeline writes to the `data_version` table.
+
+    Stamps are re-read from the database at most once every `ttl` seconds, so
+    looking one up is normally just a dictionary access. Only one caller runs
+    each re-read; the others keep using the previous stamps meanwhile, as
+    does everyone if the database can't be reached.
+    """
+
+    def __init__(self, db: Database, ttl: float = 30.0) -> None:
+        self.db = db
+        self.ttl = ttl
+
+        # Table Name -> (Version, Updated At)
+        self._versions = {}
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def stamp(self, *tables: str) -> str:
+        versions = self._current()
+
+        return ",".join(f"{t}:{versions.get(t, (0, None))[0]}" for t in tables)
+
+    def last_modified(self, *tables: str) -> datetime:
+        versions = self._current()
+
+        # Most Recent Update Across Tables, if Any Were Ever Stamped
+        updated = [versions[t][1] for t in tables if t in versions]
+
+        if not updated:
+            return None
+
+        return max(updated).astimezone(timezone.utc)
+
+    def refresh(self) -> None:
+        self._checked_at = time.monotonic()
+
+        # Keep Previous Versions if the Lookup Fails (Including Pool Timeouts
+        # & Lost Connections, which Would Otherwise Fail Every Route)
+        try:
+            out = self.db.query(Query.DATA_VERSIONS)
+        except (QueryError, psycopg2.Error):
+            return
+
+        self._versions = {row.table_name: (row.version, row.updated_at) for row in out}
+
+    def _due(self) -> bool:
+        # Claims the Next Refresh, so Concurrent Requests Don't All Run It
+        with self._lock:
+            if self._checked_at is not None and (
+                time.monotonic() - self._checked_at < self.ttl
+            ):
+                return False
+
+            self._checked_at = time.monotonic()
+
+            return True
+
+    def _current(self) -> dict:
+        # Query Outside the Lock, Requests Never Wait on Another's Refresh
+        if self._due():
+            self.refresh()
+
+        return self._versions
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Response compression for RESTful API
+
+@Author: Luke Zaruba
+@Date: Oct 18, 2026
+@Version: 0.0.0
+"""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import Iterator
+
+from flask import Flask, Response, request
+from werkzeug.datastructures import Accept
+
+from cache import ResponseCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content Types Worth Compressing
+COMPRESSIBLE = {
+    "application/json",
+    "application/geo+json",
+    "application/vnd.mapbox-vector-tile",
+    "text/html",
+    "text/plain",
+}
+
+
+class Compressor:
+    """
+    Compresses responses with gzip or brotli, negotiated via Accept-Encoding.
+
+    Responses smaller than `min_size` bytes are sent as-is. Compressed bodies
+    of responses with an ETag are kept in the response cache, keyed by that
+    ETag, so a payload is compressed once per data version and encoding.
+    """
+
+    def __init__(
+        self,
+        cache: ResponseCache,
+        min_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+    ) -> None:
+        self.cache = cache
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def init_app(self, app: Flask) -> None:
+        app.after_request(self.compress_response)
+
+    @staticmethod
+    def negotiate(accept_encodings: Accept) -> str:
+        # Prefer Brotli, then Gzip
+        if brotli is not None and accept_encodings["br"]:
+            return "br"
+
+        if accept_encodings["gzip"]:
+            return "gzip"
+
+        return None
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def compress_cached(self, body: bytes, encoding: str, etag: str = None) -> bytes:
+        if etag is None:
+            return self.compress(body, encoding)
+
+        # Reuse Compressed Body for this Exact Payload
+        key = f"compressed:{etag}:{encoding}"
+        compressed = self.cache.get(key, etag)
+
+        if compressed is None:
+            compressed = self.compress(body, encoding)
+            self.cache.put(key, etag, compressed)
+
+        return compressed
+
+    def compress_response(self, response: Response) -> Response:
+        # Leave Files, Errors & Already Encoded Responses Alone
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+
+        encoding = self.negotiate(request.accept_encodings)
+
+        if encoding is None:
+            return response
+
+        # Compress Streams Chunk by Chunk
+        if response.is_streamed:
+            response.response = self._compress_stream(response.response, encoding)
+            self._set_encoding(response, encoding)
+
+            return response
+
+        body = response.get_data()
+
+        if len(body) < self.min_size:
+            return response
+
+        response.set_data(
+            self.compress_cached(body, encoding, response.headers.get("ETag"))
+        )
+        self._set_encoding(response, encoding)
+
+        return response
+
+    def _compress_stream(self, chunks: Iterator[bytes], encoding: str) -> Iterator:
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+
+            for chunk in chunks:
+                yield compressor.process(chunk)
+
+            yield compressor.finish()
+
+        else:
+            # wbits=31 Writes a Gzip Header & Trailer
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+
+            for chunk in chunks:
+                yield compressor.compress(chunk)
+
+            yield compressor.flush()
+
+    @staticmethod
+    def _set_encoding(response: Response, encoding: str) -> None:
+        response.headers["Content-Encoding"] = encoding
+
+        # Each Encoding is its Own Representation with its Own Strong ETag
+        etag = response.headers.get("ETag")
+
+        if etag is not None:
+            response.headers["ETag"] = f'{etag[:-1]}-{encoding}"'
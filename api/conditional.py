@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Conditional request handling for RESTful API
+
+@Author: Luke Zaruba
+@Date: Oct 18, 2026
+@Version: 0.0.0
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+from typing import Callable
+
+from flask import Response, request
+from werkzeug.datastructures import ETags
+
+from cache import DataVersions
+
+
+class Conditional:
+    """
+    A decorator factory adding ETag and Last-Modified validators to routes.
+
+    Validators are derived from the data versions of the tables a route reads,
+    so conditional requests for unchanged data are answered with a 304 before
+    the route (and the database) is ever touched.
+    """
+
+    def __init__(self, versions: DataVersions) -> None:
+        self.versions = versions
+
+    def __call__(self, *tables) -> Callable:
+        """Decorates a route reading `tables`.
+
+        For routes whose tables depend on the URL, pass a single function
+        instead, called with the route's arguments & returning the tables.
+        """
+
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                read = tables[0](**kwargs) if callable(tables[0]) else tables
+
+                etag = self.etag(
+                    request.path,
+                    request.args.items(multi=True),
+                    self.versions.stamp(*read),
+                )
+                last_modified = self.versions.last_modified(*read)
+
+                # Answer Conditional Requests Without Running the Route
+                cached_etag = self.not_modified(
+                    etag,
+                    last_modified,
+                    request.if_none_match,
+                    request.if_modified_since,
+                )
+
+                if cached_etag is not None:
+                    out = Response(status=304)
+                    self.set_validators(out.headers, cached_etag, last_modified)
+
+                    return out
+
+                out = func(*args, **kwargs)
+
+                # Plain Data is Serialized by flask-restx
+                if not isinstance(out, Response):
+                    out = (out, 200, {})
+                    self.set_validators(out[2], etag, last_modified)
+
+                    return out
+
+                self.set_validators(out.headers, etag, last_modified)
+
+                return out
+
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    def etag(path: str, args, stamp: str) -> str:
+        # Strong ETag for this Route, its Arguments & the Current Data
+        key = f"{path}?{sorted(args)}|{stamp}"
+
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def not_modified(
+        etag: str, last_modified, if_none_match: ETags, if_modified_since
+    ) -> str:
+        # Returns the ETag of the Representation the Client Already Holds
+        # If-None-Match Takes Precedence Over If-Modified-Since
+        if if_none_match:
+            # Compressed Representations Carry an Encoding Suffix
+            for tag in (etag, f"{etag}-gzip", f"{etag}-br"):
+                if if_none_match.contains(tag):
+                    return tag
+
+            return None
+
+        if if_modified_since and last_modified is not None:
+            if last_modified.replace(microsecond=0) <= if_modified_since:
+                return etag
+
+        return None
+
+    @staticmethod
+    def set_validators(headers, etag: str, last_modified) -> None:
+        headers["ETag"] = f'"{etag}"'
+        headers["Cache-Control"] = "no-cache"
+
+        if last_modified is not None:
+            headers["Last-Modified"] = last_modified.strftime(
+                "%a, %d %b %Y %H:%M:%S GMT"
+            )
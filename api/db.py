@@ -10,14 +10,363 @@ Database handling for RESTful API
 
 from __future__ import annotations
 
+import functools
 import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, datetime
+from types import ModuleType
+from typing import Callable, Iterator, NamedTuple
 
 import psycopg2
+import psycopg2.extensions
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2 import sql
+from psycopg2.pool import PoolError
+
+from instrumentation import QueryStats, replica_gauge, row_size
+
+# Columns Exposed as GeoJSON Properties, per Table (Key Column First)
+COLUMNS = {
+    "geo_accidents_mn": [
+        "icr",
+        "incident_type",
+        "incident_date",
+        "district",
+        "location_description",
+        "road_condition",
+        "vehicles_involved",
+        "x",
+        "y",
+        "city_id",
+    ],
+    "ctu_accidents": [
+        "id",
+        "ctu_name",
+        "class",
+        "county",
+        "pop",
+        "total_road_length",
+        "aadt_sum",
+        "aadt_mean",
+        "total_incident_count",
+        "predicted_count",
+        "lmi_i",
+        "lmi_q",
+        "lmi_p",
+        "lmi_sig",
+        "lmi_label",
+    ],
+    "crnt_clstr_ftprnt": ["cluster_id"],
+    "clstr_ts_ftprnt": ["cluster_id", "cluster_year"],
+    "clstr_union_ftprnt": ["cluster_id", "stability_count"],
+}
+
+
+class QueryError(Exception):
+    """
+    Raised when a query fails and its transaction has been rolled back.
+    """
+
+
+class PoolTimeout(PoolError):
+    """
+    Raised when no connection becomes available before the checkout timeout.
+    """
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of psycopg2 connections.
+
+    Connections are opened lazily up to `max_size`, health checked when they
+    are checked out after sitting idle for `check_interval` seconds, and
+    callers wait at most `timeout` seconds for a free connection.
+    """
+
+    def __init__(
+        self,
+        connect: Callable,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        check_interval: float = 30.0,
+    ) -> None:
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+
+        # Idle Connections & Time They Were Returned
+        self._idle = deque()
+
+        # Number of Open Connections (Idle + Checked Out)
+        self._size = 0
+
+        self._lock = threading.Condition()
+        self._closed = False
+
+    def open(self) -> None:
+        # Fill Pool up to Minimum Size
+        while True:
+            with self._lock:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+
+            self.putconn(self._new_connection())
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            with self._lock:
+                # Wait for an Idle Connection or a Free Slot
+                while (
+                    not self._closed and not self._idle and self._size >= self.max_size
+                ):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(
+                            f"No connection available within {self.timeout} seconds"
+                        )
+                    self._lock.wait(remaining)
+
+                if self._closed:
+                    raise PoolError("Connection pool is closed")
+
+                if self._idle:
+                    # Most Recently Used First, Keeps Hot Connections Busy
+                    conn, returned_at = self._idle.pop()
+                else:
+                    conn, returned_at = None, None
+                    self._size += 1
+
+            if conn is None:
+                return self._new_connection()
+
+            if self._is_healthy(conn, returned_at):
+                return conn
+
+            self._discard(conn)
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        # Reset Any Open Transaction Before Reuse
+        if not discard and not conn.closed:
+            if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    discard = True
+
+        with self._lock:
+            if not (discard or conn.closed or self._closed):
+                self._idle.append((conn, time.monotonic()))
+                self._lock.notify()
+                return
+
+        self._discard(conn)
+
+    def closeall(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._lock.notify_all()
+
+        for conn in idle:
+            conn.close()
+
+    def _new_connection(self):
+        try:
+            return self._connect()
+        except BaseException:
+            # Release Reserved Slot
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+
+    def _is_healthy(self, conn, returned_at: float) -> bool:
+        if conn.closed:
+            return False
+
+        # Skip Round Trip for Recently Used Connections
+        if time.monotonic() - returned_at < self.check_interval:
+            return True
+
+        try:
+            with conn.cursor() as c:
+                c.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn) -> None:
+        with self._lock:
+            self._size -= 1
+            self._lock.notify()
+
+        if not conn.closed:
+            conn.close()
+
+
+class ReadRouter:
+    """
+    Chooses where reads go: healthy replicas in turn, then the primary.
+
+    A replica whose connection fails is skipped for `retry_after` seconds,
+    after which it is tried again & back in rotation once it connects.
+    """
+
+    # Stands in for the Primary in `candidates`
+    PRIMARY = None
+
+    def __init__(self, replicas: list, retry_after: float = 30.0) -> None:
+        self.replicas = list(replicas)
+        self.retry_after = retry_after
+
+        # Replica -> Time it May be Retried
+        self._down = {}
+        self._turn = 0
+        self._lock = threading.Lock()
+
+    def candidates(self) -> list:
+        now = time.monotonic()
+
+        with self._lock:
+            # Round Robin Over Replicas
+            start = self._turn
+            self._turn += 1
+
+            ordered = [
+                self.replicas[(start + i) % len(self.replicas)]
+                for i in range(len(self.replicas))
+            ]
+
+            healthy = [r for r in ordered if self._down.get(r, 0) <= now]
+
+        return healthy + [self.PRIMARY]
+
+    def mark_down(self, replica: str) -> None:
+        with self._lock:
+            self._down[replica] = time.monotonic() + self.retry_after
+
+    def mark_up(self, replica: str) -> None:
+        with self._lock:
+            self._down.pop(replica, None)
+
+    def status(self) -> dict:
+        now = time.monotonic()
+
+        with self._lock:
+            return {r: self._down.get(r, 0) <= now for r in self.replicas}
+
+
+def split_host(endpoint: str, default_port) -> tuple:
+    """Splits a `host[:port]` endpoint."""
+    host, _, port = endpoint.partition(":")
+
+    return host, port or default_port
+
+
+class Statement:
+    """
+    A named query, prepared once per pooled connection & executed with bound
+    parameters.
+
+    `text` uses `%(name)s` placeholders; rows are decoded into `row` (e.g. a
+    `NamedTuple`) when given. The name is taken from the attribute the
+    statement is assigned to.
+    """
+
+    def __init__(self, text: str, row: Callable = None) -> None:
+        self.text = text.strip().rstrip(";")
+        self.row = row
+        self.name = None
+
+        # Placeholders in Order of First Use, Numbered for PREPARE
+        self.params = []
+        self.prepared_text = re.sub(r"%\((\w+)\)s", self._number, self.text)
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Statement({self.name!r})"
+
+    def _number(self, match: re.Match) -> str:
+        if match.group(1) not in self.params:
+            self.params.append(match.group(1))
+
+        return f"${self.params.index(match.group(1)) + 1}"
+
+    def prepare(self) -> str:
+        return f"PREPARE {self.name} AS {self.prepared_text}"
+
+    def execute(self) -> str:
+        if not self.params:
+            return f"EXECUTE {self.name}"
+
+        return f"EXECUTE {self.name} ({', '.join(f'%({p})s' for p in self.params)})"
+
+    def decode(self, rows: list) -> list:
+        if self.row is None:
+            return rows
+
+        return [self.row(*row) for row in rows]
+
+
+class PreparedConnection(psycopg2.extensions.connection):
+    """
+    A psycopg2 connection remembering the statements prepared on it.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+# Typed Rows
+class Version(NamedTuple):
+    table_name: str
+    version: int
+    updated_at: datetime
+
+
+class Count(NamedTuple):
+    category: str | int
+    total: int
+
+
+class Week(NamedTuple):
+    incident_count: int
+    week: date
 
 
 class Database:
     def __init__(
-        self, host: str, user: str, password: str, db_name: str, port: int
+        self,
+        host: str,
+        user: str,
+        password: str,
+        db_name: str,
+        port: int,
+        min_connections: int = 1,
+        max_connections: int = 10,
+        timeout: float = 30.0,
+        read_hosts: list = None,
+        connect_timeout: int = 5,
+        retry_after: float = 30.0,
     ) -> None:
         self.host = host
         self.user = user
@@ -25,8 +374,24 @@ class Database:
         self.db_name = db_name
         self.port = port
 
-        # Set Connection to None
-        self.connection = None
+        # Pool Settings
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+
+        # Read Replicas (`host[:port]`), Used Before the Primary
+        self.router = ReadRouter(read_hosts or [], retry_after)
+
+        # Query Timings, Row Counts & Sizes
+        self.stats = QueryStats()
+
+        # Pools are Created on First Use, per Process
+        self.pool = None
+        self.read_pools = {}
+        self._pool_pid = None
+        self._inherited_pool = None
+        self._pool_lock = threading.Lock()
 
     @classmethod
     def initialize_from_env(cls) -> Database:
@@ -37,153 +402,695 @@ class Database:
         db_name = os.environ.get("DB_NAME")
         port = os.environ.get("DB_PORT")
 
+        # Extract Pool Settings
+        min_connections = int(os.environ.get("DB_POOL_MIN", 1))
+        max_connections = int(os.environ.get("DB_POOL_MAX", 10))
+        timeout = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+
+        # Extract Read Replicas, e.g. "replica-1,replica-2:5433"
+        read_hosts = [h.strip() for h in os.environ.get("DB_READ_HOSTS", "").split(",")]
+        connect_timeout = int(os.environ.get("DB_CONNECT_TIMEOUT", 5))
+        retry_after = float(os.environ.get("DB_READ_RETRY_AFTER", 30))
+
         # Return Instance
-        return cls(host, user, password, db_name, port)
+        return cls(
+            host,
+            user,
+            password,
+            db_name,
+            port,
+            min_connections=min_connections,
+            max_connections=max_connections,
+            timeout=timeout,
+            read_hosts=[h for h in read_hosts if h],
+            connect_timeout=connect_timeout,
+            retry_after=retry_after,
+        )
 
     def connect(self) -> None:
-        self.connection = psycopg2.connect(
-            host=self.host,
+        with self._pool_lock:
+            if self.pool is not None and self._pool_pid != os.getpid():
+                # Pools were Inherited Through Fork, their Connections Belong to
+                # the Parent; Keep a Reference so they are Never Closed from Here
+                self._inherited_pool = (self.pool, self.read_pools)
+                self.pool = None
+                self.read_pools = {}
+
+            if self.pool is None:
+                self.pool = ConnectionPool(
+                    self._new_connection,
+                    min_size=self.min_connections,
+                    max_size=self.max_connections,
+                    timeout=self.timeout,
+                )
+                self.pool.open()
+
+                for replica in self.router.replicas:
+                    self.read_pools[replica] = self._replica_pool(replica)
+
+                self._pool_pid = os.getpid()
+
+    def _replica_pool(self, replica: str) -> ConnectionPool:
+        host, port = split_host(replica, self.port)
+
+        # Give Up on a Busy Replica Quickly, the Primary Can Take the Read
+        pool = ConnectionPool(
+            functools.partial(self._new_connection, host, port),
+            min_size=self.min_connections,
+            max_size=self.max_connections,
+            timeout=min(self.timeout, self.connect_timeout),
+        )
+
+        try:
+            pool.open()
+        except psycopg2.OperationalError:
+            self.router.mark_down(replica)
+
+        return pool
+
+    def _new_connection(self, host: str = None, port: int = None):
+        connection = psycopg2.connect(
+            host=host or self.host,
             database=self.db_name,
             user=self.user,
             password=self.password,
-            port=self.port,
+            port=port or self.port,
+            connect_timeout=self.connect_timeout,
+            connection_factory=PreparedConnection,
         )
 
-    def query(self, query: str) -> str:
-        # Open Cursor
-        with self.connection.cursor() as c:
-            # Try to Execute
+        # The API Only Reads; Statements Run Read Only Without BEGIN/COMMIT
+        # (Set as a Session Default, as psycopg2 Resets its Own `readonly`
+        # When Autocommit is Toggled for Streams)
+        connection.autocommit = True
+
+        with connection.cursor() as c:
+            c.execute("SET default_transaction_read_only = on")
+
+        return connection
+
+    @contextmanager
+    def _connection(self) -> Iterator:
+        # Replicas First, Falling Back to the Primary
+        for replica in self.router.candidates():
+            pool = self.pool if replica is None else self.read_pools[replica]
+
             try:
-                # Execute Query
-                c.execute(query)
+                connection = pool.getconn()
+
+                # Back in Rotation Once a Connection Succeeds Again
+                if replica is not None:
+                    self.router.mark_up(replica)
+
+                break
+
+            except PoolTimeout:
+                if replica is None:
+                    raise
+
+            except psycopg2.OperationalError:
+                if replica is None:
+                    raise
+
+                self.router.mark_down(replica)
+
+        try:
+            yield connection
+
+        finally:
+            # Connections Closed by a Failure are Discarded by the Pool
+            if connection.closed and replica is not None:
+                self.router.mark_down(replica)
+
+            pool.putconn(connection)
+
+    def _execute(self, connection, c, query, params: dict = None) -> None:
+        if not isinstance(query, Statement):
+            c.execute(query, params)
+            return
+
+        # Prepare on First Use per Connection
+        if query.name not in connection.prepared:
+            c.execute(query.prepare())
+            connection.prepared.add(query.name)
+
+        c.execute(query.execute(), params)
+
+    def query(self, query: str, params: dict = None, name: str = None) -> list:
+        name = name or query_name(query)
+
+        # Open Pool on First Use (& After Fork)
+        if self.pool is None or self._pool_pid != os.getpid():
+            self.connect()
+
+        start = time.perf_counter()
+
+        # Borrow Connection from a Replica or the Primary
+        with self._connection() as connection:
+            self.stats.observe(name, "connect", time.perf_counter() - start)
+
+            # Open Cursor
+            with connection.cursor() as c:
+                # Try to Execute
+                try:
+                    # Execute Query
+                    start = time.perf_counter()
+                    self._execute(connection, c, query, params)
+                    self.stats.observe(name, "execute", time.perf_counter() - start)
+
+                    # Return Output
+                    start = time.perf_counter()
+                    out = c.fetchall()
+                    self.stats.observe(name, "fetch", time.perf_counter() - start)
+                    self.stats.record_result(name, out)
+
+                except psycopg2.Error as e:
+                    self.stats.record_error(name)
+
+                    # Surface Error
+                    raise QueryError("Error: " + str(e)) from e
 
-                # Commit to DB
-                self.connection.commit()
+        if isinstance(query, Statement):
+            return query.decode(out)
 
-                # Return Output
-                return c.fetchall()
+        return out
 
-            except Exception as e:
-                # Roll Back Transaction if Invalid Query
-                self.connection.rollback()
+    def stream(
+        self,
+        query: str,
+        params: dict = None,
+        batch_size: int = 1000,
+        name: str = None,
+    ) -> Iterator:
+        name = name or query_name(query)
 
-                # Display Error
-                return "Error: " + str(e)
+        # Open Pool on First Use (& After Fork)
+        if self.pool is None or self._pool_pid != os.getpid():
+            self.connect()
+
+        start = time.perf_counter()
+
+        # Borrow Connection for the Lifetime of the Stream
+        with self._connection() as connection:
+            self.stats.observe(name, "connect", time.perf_counter() - start)
+
+            # Named Cursors Need a Transaction, Rolled Back as Nothing is Written
+            connection.autocommit = False
+
+            try:
+                yield from self._stream(connection, query, params, batch_size, name)
+
+            finally:
+                if not connection.closed:
+                    connection.rollback()
+                    connection.autocommit = True
+
+    def _stream(
+        self, connection, query, params: dict, batch_size: int, name: str
+    ) -> Iterator:
+        # DECLARE Can't Run a Prepared Statement, so Streams Send the Text
+        decode = None
+
+        if isinstance(query, Statement):
+            query, decode = query.text, query.row
+
+        # Named Cursors Keep Results on the Server & Fetch in Batches
+        with connection.cursor(name="stream") as c:
+            c.itersize = batch_size
+
+            try:
+                start = time.perf_counter()
+                c.execute(query, params)
+                self.stats.observe(name, "execute", time.perf_counter() - start)
+
+                # Time Spent Fetching, Excluding Time Spent by the Consumer
+                rows = iter(c)
+                fetch, count, size = 0.0, 0, 0
+
+                while True:
+                    start = time.perf_counter()
+                    row = next(rows, None)
+                    fetch += time.perf_counter() - start
+
+                    if row is None:
+                        break
+
+                    count += 1
+                    size += row_size(row)
+
+                    yield decode(*row) if decode else row
+
+                self.stats.observe(name, "fetch", fetch)
+                self.stats.record_rows(name, count, size)
+
+            except psycopg2.Error as e:
+                self.stats.record_error(name)
+
+                # Surface Error
+                raise QueryError("Error: " + str(e)) from e
+
+    def metrics(self) -> str:
+        """Query timings & replica status in the Prometheus text format."""
+        return self.stats.render() + replica_gauge(self.router.status())
 
     def close(self):
-        # Close Connection
-        self.connection.close()
+        # Close Pooled Connections
+        with self._pool_lock:
+            if self.pool is not None and self._pool_pid == os.getpid():
+                self.pool.closeall()
+
+                for pool in self.read_pools.values():
+                    pool.closeall()
 
-        # Set Connection to None
-        self.connection = None
+            # Set Pools to None
+            self.pool = None
+            self.read_pools = {}
 
 
 class Query:
     """
-    A class used to store SQL queries.
+    A class used to store SQL queries, each a `Statement` prepared on first
+    use per connection.
     """
 
+    # Data Version Queries
+    DATA_VERSIONS = Statement(
+        """
+        SELECT table_name, version, updated_at
+        FROM data_version;
+        """,
+        row=Version,
+    )
+
     # Incident Queries
-    INCIDENT_GEOJSON = """
-    SELECT json_build_object(
-    'type', 'FeatureCollection',
-    'features', json_agg(ST_AsGeoJSON(gam.*)::json))
-    FROM geo_accidents_mn gam;
-    """
+    INCIDENT_GEOJSON = Statement(
+        """
+        SELECT json_build_object(
+        'type', 'FeatureCollection',
+        'features', json_agg(ST_AsGeoJSON(gam.*)::json))::text
+        FROM geo_accidents_mn gam;
+        """
+    )
 
-    # INCIDENT_ICR = """
-    # SELECT json_agg(ST_AsGeoJSON(gam.*)::json))
-    # FROM geo_accidents_mn gam
-    # WHERE gam.icr == %s;
-    # """
+    INCIDENT_FEATURES = Statement(
+        """
+        SELECT ST_AsGeoJSON(gam.*)
+        FROM geo_accidents_mn gam;
+        """
+    )
 
-    INCIDENT_TOTAL = """
-    SELECT COUNT(icr)
-    FROM raw_accidents;
-    """
+    INCIDENT_ICR = Statement(
+        """
+        SELECT ST_AsGeoJSON(gam.*)
+        FROM geo_accidents_mn gam
+        WHERE gam.icr = %(icr)s
+        LIMIT 1;
+        """
+    )
 
-    INCIDENT_LAST_WEEK = """
-    SELECT incident_count
-    FROM glb_wk_time_series
-    ORDER BY week DESC
-    LIMIT(1);
-    """
+    INCIDENT_TOTAL = Statement(
+        """
+        SELECT COUNT(icr)
+        FROM raw_accidents;
+        """
+    )
 
-    INCIDENT_CURRENT_CLUSTERS = """
-    SELECT json_build_object(
-    'type', 'FeatureCollection',
-    'features', json_agg(ST_AsGeoJSON(ccf.*)::json))
-    FROM crnt_clstr_ftprnt ccf;
-    """
+    INCIDENT_LAST_WEEK = Statement(
+        """
+        SELECT incident_count
+        FROM glb_wk_time_series
+        ORDER BY week DESC
+        LIMIT(1);
+        """
+    )
 
-    INCIDENT_YEARLY_CLUSTERS = """
-    SELECT json_build_object(
-    'type', 'FeatureCollection',
-    'features', json_agg(ST_AsGeoJSON(ctf.*)::json))
-    FROM clstr_ts_ftprnt ctf;
-    """
+    INCIDENT_CURRENT_CLUSTERS = Statement(
+        """
+        SELECT json_build_object(
+        'type', 'FeatureCollection',
+        'features', json_agg(ST_AsGeoJSON(ccf.*)::json))::text
+        FROM crnt_clstr_ftprnt ccf;
+        """
+    )
 
-    INCIDENT_CLUSTER_STABILITY = """
-    SELECT json_build_object(
-    'type', 'FeatureCollection',
-    'features', json_agg(ST_AsGeoJSON(cuf.*)::json))
-    FROM clstr_union_ftprnt cuf;
-    """
+    INCIDENT_CURRENT_CLUSTER_FEATURES = Statement(
+        """
+        SELECT ST_AsGeoJSON(ccf.*)
+        FROM crnt_clstr_ftprnt ccf;
+        """
+    )
+
+    INCIDENT_YEARLY_CLUSTERS = Statement(
+        """
+        SELECT json_build_object(
+        'type', 'FeatureCollection',
+        'features', json_agg(ST_AsGeoJSON(ctf.*)::json))::text
+        FROM clstr_ts_ftprnt ctf;
+        """
+    )
+
+    INCIDENT_YEARLY_CLUSTER_FEATURES = Statement(
+        """
+        SELECT ST_AsGeoJSON(ctf.*)
+        FROM clstr_ts_ftprnt ctf;
+        """
+    )
+
+    INCIDENT_CLUSTER_STABILITY = Statement(
+        """
+        SELECT json_build_object(
+        'type', 'FeatureCollection',
+        'features', json_agg(ST_AsGeoJSON(cuf.*)::json))::text
+        FROM clstr_union_ftprnt cuf;
+        """
+    )
+
+    INCIDENT_CLUSTER_STABILITY_FEATURES = Statement(
+        """
+        SELECT ST_AsGeoJSON(cuf.*)
+        FROM clstr_union_ftprnt cuf;
+        """
+    )
 
     # CTU Queries
-    CTU_GEOJSON = """
-    SELECT json_build_object(
-    'type', 'FeatureCollection',
-    'features', json_agg(ST_AsGeoJSON(ctu.*)::json))
-    FROM ctu_accidents ctu;
-    """
+    CTU_GEOJSON = Statement(
+        """
+        SELECT json_build_object(
+        'type', 'FeatureCollection',
+        'features', json_agg(ST_AsGeoJSON(ctu.*)::json))::text
+        FROM ctu_accidents ctu;
+        """
+    )
+
+    CTU_FEATURES = Statement(
+        """
+        SELECT ST_AsGeoJSON(ctu.*)
+        FROM ctu_accidents ctu;
+        """
+    )
+
+    # Vector Tile Queries
+    TILE_INCIDENTS = Statement(
+        """
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS geom
+        )
+        SELECT ST_AsMVT(tile.*, 'incidents')
+        FROM (
+            SELECT ST_AsMVTGeom(ST_Transform(gam.geom, 3857), bounds.geom) AS geom,
+            gam.icr, gam.incident_type, gam.incident_date::text AS incident_date,
+            gam.road_condition, gam.vehicles_involved
+            FROM geo_accidents_mn gam, bounds
+            WHERE ST_Intersects(gam.geom, ST_Transform(bounds.geom, 4326))
+        ) tile;
+        """
+    )
+
+    TILE_CTU = Statement(
+        """
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS geom
+        )
+        SELECT ST_AsMVT(tile.*, 'ctu')
+        FROM (
+            SELECT ST_AsMVTGeom(ST_Transform(ctu.geom, 3857), bounds.geom) AS geom,
+            ctu.id, ctu.ctu_name, ctu.class, ctu.county, ctu.pop,
+            ctu.total_incident_count, ctu.lmi_label
+            FROM ctu_accidents ctu, bounds
+            WHERE ST_Intersects(ctu.geom, ST_Transform(bounds.geom, 4326))
+        ) tile;
+        """
+    )
+
+    TILE_CURRENT_CLUSTERS = Statement(
+        """
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS geom
+        )
+        SELECT ST_AsMVT(tile.*, 'crnt-clstr-ftprnt')
+        FROM (
+            SELECT ST_AsMVTGeom(ST_Transform(ccf.geom, 3857), bounds.geom) AS geom,
+            ccf.cluster_id
+            FROM crnt_clstr_ftprnt ccf, bounds
+            WHERE ST_Intersects(ccf.geom, ST_Transform(bounds.geom, 4326))
+        ) tile;
+        """
+    )
+
+    TILE_YEARLY_CLUSTERS = Statement(
+        """
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS geom
+        )
+        SELECT ST_AsMVT(tile.*, 'yrly-clstr-ftprnt')
+        FROM (
+            SELECT ST_AsMVTGeom(ST_Transform(ctf.geom, 3857), bounds.geom) AS geom,
+            ctf.cluster_id, ctf.cluster_year
+            FROM clstr_ts_ftprnt ctf, bounds
+            WHERE ST_Intersects(ctf.geom, ST_Transform(bounds.geom, 4326))
+        ) tile;
+        """
+    )
+
+    TILE_CLUSTER_STABILITY = Statement(
+        """
+        WITH bounds AS (
+            SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS geom
+        )
+        SELECT ST_AsMVT(tile.*, 'clstr-ftprnt-stblty')
+        FROM (
+            SELECT ST_AsMVTGeom(ST_Transform(cuf.geom, 3857), bounds.geom) AS geom,
+            cuf.cluster_id, cuf.stability_count
+            FROM clstr_union_ftprnt cuf, bounds
+            WHERE ST_Intersects(cuf.geom, ST_Transform(bounds.geom, 4326))
+        ) tile;
+        """
+    )
 
     # Metrics Queries
-    METRICS_TIMESERIES = """
-    SELECT *
-    FROM glb_wk_time_series
-    ORDER BY week;
-    """
+    METRICS_TIMESERIES = Statement(
+        """
+        SELECT *
+        FROM glb_wk_time_series
+        ORDER BY week;
+        """,
+        row=Week,
+    )
 
-    METRICS_ALCOHOL = """
-    SELECT alcohol, COUNT(alcohol)
-    FROM raw_people
-    GROUP BY alcohol
-    ORDER BY COUNT(alcohol);
-    """
+    # Metrics Read from Rollups Maintained by the Aggregator
+    METRICS_ALCOHOL = Statement(
+        """
+        SELECT category, total
+        FROM metric_rollups
+        WHERE metric = 'alcohol'
+        ORDER BY total;
+        """,
+        row=Count,
+    )
 
-    METRICS_SEATBELT = """
-    SELECT seatbelt, COUNT(seatbelt)
-    FROM raw_people
-    GROUP BY seatbelt
-    ORDER BY COUNT(seatbelt);
-    """
+    METRICS_SEATBELT = Statement(
+        """
+        SELECT category, total
+        FROM metric_rollups
+        WHERE metric = 'seatbelt'
+        ORDER BY total;
+        """,
+        row=Count,
+    )
 
-    METRICS_HELMET = """
-    SELECT helmet, COUNT(helmet)
-    FROM raw_people
-    GROUP BY helmet
-    ORDER BY COUNT(helmet);
-    """
+    METRICS_HELMET = Statement(
+        """
+        SELECT category, total
+        FROM metric_rollups
+        WHERE metric = 'helmet'
+        ORDER BY total;
+        """,
+        row=Count,
+    )
 
-    METRICS_CONDITION = """
-    SELECT road_condition, COUNT(road_condition)
-    FROM raw_accidents
-    WHERE road_condition <> ''
-    GROUP BY road_condition
-    ORDER BY COUNT(road_condition);
-    """
+    METRICS_CONDITION = Statement(
+        """
+        SELECT category, total
+        FROM metric_rollups
+        WHERE metric = 'condition' AND category <> ''
+        ORDER BY total;
+        """,
+        row=Count,
+    )
 
-    METRICS_TYPE = """
-    SELECT incident_type, COUNT(incident_type)
-    FROM raw_accidents
-    GROUP BY incident_type;
-    """
+    METRICS_TYPE = Statement(
+        """
+        SELECT category, total
+        FROM metric_rollups
+        WHERE metric = 'accident-type';
+        """,
+        row=Count,
+    )
 
-    METRICS_VEHICLE_COUNT = """
-    SELECT vehicles_involved, COUNT(vehicles_involved)
-    FROM raw_accidents
-    WHERE vehicles_involved < 100
-    GROUP BY vehicles_involved
-    ORDER BY vehicles_involved;
+    # AND Clauses Run in Any Order, so Only Vehicle Count Categories are Cast
+    METRICS_VEHICLE_COUNT = Statement(
+        """
+        SELECT category::int, total
+        FROM metric_rollups
+        WHERE metric = 'vehicle-count'
+        AND CASE WHEN metric = 'vehicle-count' THEN category::int END < 100
+        ORDER BY category::int;
+        """,
+        row=Count,
+    )
+
+    # All Metrics in One Round Trip
+    # Weeks are Written as HTTP Dates, as the Serializer Does for /metrics/timeseries
+    METRICS_SUMMARY = Statement(
+        """
+        SELECT json_build_object(
+        'alcohol', (
+            SELECT json_agg(json_build_array(category, total) ORDER BY total)
+            FROM metric_rollups
+            WHERE metric = 'alcohol'
+        ),
+        'seatbelt', (
+            SELECT json_agg(json_build_array(category, total) ORDER BY total)
+            FROM metric_rollups
+            WHERE metric = 'seatbelt'
+        ),
+        'helmet', (
+            SELECT json_agg(json_build_array(category, total) ORDER BY total)
+            FROM metric_rollups
+            WHERE metric = 'helmet'
+        ),
+        'condition', (
+            SELECT json_agg(json_build_array(category, total) ORDER BY total)
+            FROM metric_rollups
+            WHERE metric = 'condition' AND category <> ''
+        ),
+        'accident-type', (
+            SELECT json_agg(json_build_array(category, total))
+            FROM metric_rollups
+            WHERE metric = 'accident-type'
+        ),
+        'vehicle-count', (
+            SELECT json_agg(
+                json_build_array(category::int, total) ORDER BY category::int
+            )
+            FROM metric_rollups
+            WHERE metric = 'vehicle-count'
+            AND CASE WHEN metric = 'vehicle-count' THEN category::int END < 100
+        ),
+        'timeseries', (
+            SELECT json_agg(
+                json_build_array(
+                    incident_count,
+                    to_char(week, 'Dy, DD Mon YYYY "00:00:00 GMT"')
+                )
+                ORDER BY week
+            )
+            FROM glb_wk_time_series
+        ))::text;
+        """
+    )
+
+
+# Vector Tile Layers -> (Query, Source Table)
+TILE_LAYERS = {
+    "incidents": (Query.TILE_INCIDENTS, "geo_accidents_mn"),
+    "ctu": (Query.TILE_CTU, "ctu_accidents"),
+    "crnt-clstr-ftprnt": (Query.TILE_CURRENT_CLUSTERS, "crnt_clstr_ftprnt"),
+    "yrly-clstr-ftprnt": (Query.TILE_YEARLY_CLUSTERS, "clstr_ts_ftprnt"),
+    "clstr-ftprnt-stblty": (Query.TILE_CLUSTER_STABILITY, "clstr_union_ftprnt"),
+}
+
+
+def tile_tables(layer: str, **_) -> list:
+    # A Tile Only Changes with its Own Layer's Table
+    return [TILE_LAYERS[layer][1]] if layer in TILE_LAYERS else []
+
+
+def query_name(query) -> str:
+    """Returns the name of a `Statement`, or "dynamic"."""
+    if isinstance(query, Statement):
+        return query.name
+
+    return "dynamic"
+
+
+def geojson_query(
+    table: str,
+    fields: list = None,
+    bbox: bool = False,
+    start: bool = False,
+    end: bool = False,
+    limit: bool = False,
+    simplified: bool = False,
+    collection: bool = True,
+    composer: ModuleType = sql,
+) -> sql.Composed:
+    """Builds a GeoJSON query over one of the tables in `COLUMNS`.
+
+    Args:
+        table (str): Table to read features from.
+        fields (list): Columns to include as properties, defaults to all.
+        bbox (bool): Keep features intersecting the %(xmin)s..%(ymax)s envelope.
+        start (bool): Keep incidents on or after the %(start)s date.
+        end (bool): Keep incidents on or before the %(end)s date.
+        limit (bool): Return at most %(limit)s features, ordered by the
+            table's key column.
+        simplified (bool): Simplify geometries by %(tolerance)s degrees.
+        collection (bool): Return one FeatureCollection row instead of a row
+            per feature. Both are returned as GeoJSON text.
+        composer (module): SQL composition module of the driver running the
+            query, `psycopg2.sql` or `psycopg.sql`.
+
+    All variants round coordinates to %(precision)s decimal digits.
     """
+    geom = composer.SQL("geom")
+
+    if simplified:
+        geom = composer.SQL("ST_SimplifyPreserveTopology(geom, %(tolerance)s)")
+
+    source = composer.SQL("SELECT {columns}, {geom} AS geom FROM {table}").format(
+        columns=composer.SQL(", ").join(
+            map(composer.Identifier, fields or COLUMNS[table])
+        ),
+        geom=geom,
+        table=composer.Identifier(table),
+    )
+
+    # Filters, Each Backed by an Index
+    conditions = []
+
+    if bbox:
+        conditions.append(
+            composer.SQL(
+                "ST_Intersects("
+                "geom, ST_MakeEnvelope(%(xmin)s, %(ymin)s, %(xmax)s, %(ymax)s, 4326))"
+            )
+        )
+
+    if start:
+        conditions.append(composer.SQL("incident_date >= %(start)s"))
+
+    if end:
+        conditions.append(composer.SQL("incident_date < %(end)s::date + 1"))
+
+    if conditions:
+        source += composer.SQL(" WHERE ") + composer.SQL(" AND ").join(conditions)
+
+    # Stable Order, so Repeated Requests Sharing an ETag Get the Same Features
+    if limit:
+        source += composer.SQL(" ORDER BY {key} LIMIT %(limit)s").format(
+            key=composer.Identifier(COLUMNS[table][0])
+        )
+
+    feature = composer.SQL("ST_AsGeoJSON(f.*, 'geom', %(precision)s)")
+
+    if collection:
+        feature = composer.SQL(
+            "json_build_object("
+            "'type', 'FeatureCollection', "
+            "'features', COALESCE(json_agg({feature}::json), '[]'::json))::text"
+        ).format(feature=feature)
+
+    return composer.SQL("SELECT {feature} FROM ({source}) f;").format(
+        feature=feature, source=source
+    )
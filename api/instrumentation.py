@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Query instrumentation for RESTful API
+
+Timings are kept per process; with several workers, each reports its own.
+
+@Author: Luke Zaruba
+@Date: Oct 18, 2026
+@Version: 0.0.0
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from contextvars import ContextVar
+
+# Histogram Upper Bounds in Seconds (Prometheus Client Defaults)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Content Type of the Prometheus Text Exposition Format
+PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Phases of a Query, in Order
+PHASES = ("connect", "execute", "fetch")
+
+# (Phase, Seconds) Recorded During the Current Request, if Tracked
+_request_timings = ContextVar("request_timings", default=None)
+
+
+def track_request() -> list:
+    """Starts collecting query timings for the current request (or task)."""
+    timings = []
+    _request_timings.set(timings)
+
+    return timings
+
+
+def server_timing(timings: list, total: float) -> str:
+    """Formats a request's query timings as a `Server-Timing` header."""
+    durations = dict.fromkeys(PHASES, 0.0)
+
+    for phase, seconds in timings:
+        durations[phase] += seconds
+
+    metrics = [
+        f"db-{phase};dur={seconds * 1000:.2f}"
+        for phase, seconds in durations.items()
+        if seconds
+    ]
+    metrics.append(f"total;dur={total * 1000:.2f}")
+
+    return ", ".join(metrics)
+
+
+def row_size(row: tuple) -> int:
+    """Payload size of a row, counting its text & binary values."""
+    return sum(
+        len(value) for value in row if isinstance(value, (str, bytes, memoryview))
+    )
+
+
+def replica_gauge(status: dict) -> str:
+    """Renders which read replicas are in use, in the Prometheus text format."""
+    if not status:
+        return ""
+
+    lines = [
+        "# HELP api_db_replica_up Read replica in rotation (1) or skipped after "
+        "a failure (0).",
+        "# TYPE api_db_replica_up gauge",
+    ]
+
+    for replica, up in sorted(status.items()):
+        lines.append(f'api_db_replica_up{{replica="{replica}"}} {int(up)}')
+
+    return "\n".join(lines) + "\n"
+
+
+class QueryStats:
+    """
+    Histograms of query phase durations, plus row, byte & error counters,
+    labelled by query name and rendered in the Prometheus text format.
+    """
+
+    def __init__(self, buckets: tuple = BUCKETS) -> None:
+        self.buckets = buckets
+
+        # (Query, Phase) -> [Bucket Counts..., +Inf Count], Sum
+        self._histograms = {}
+        self._sums = {}
+
+        # Query -> Count
+        self._rows = {}
+        self._bytes = {}
+        self._errors = {}
+
+        self._lock = threading.Lock()
+
+    def observe(self, query: str, phase: str, seconds: float) -> None:
+        timings = _request_timings.get()
+
+        if timings is not None:
+            timings.append((phase, seconds))
+
+        key = (query, phase)
+        index = bisect.bisect_left(self.buckets, seconds)
+
+        with self._lock:
+            if key not in self._histograms:
+                self._histograms[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+
+            self._histograms[key][index] += 1
+            self._sums[key] += seconds
+
+    def record_result(self, query: str, rows: list) -> None:
+        self.record_rows(query, len(rows), sum(map(row_size, rows)))
+
+    def record_rows(self, query: str, rows: int, size: int) -> None:
+        with self._lock:
+            self._rows[query] = self._rows.get(query, 0) + rows
+            self._bytes[query] = self._bytes.get(query, 0) + size
+
+    def record_error(self, query: str) -> None:
+        with self._lock:
+            self._errors[query] = self._errors.get(query, 0) + 1
+
+    def render(self) -> str:
+        with self._lock:
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+            sums = dict(self._sums)
+            counters = {
+                "api_db_rows_total": ("Rows returned per query.", dict(self._rows)),
+                "api_db_bytes_total": (
+                    "Text & binary bytes returned per query.",
+                    dict(self._bytes),
+                ),
+                "api_db_errors_total": ("Failed queries.", dict(self._errors)),
+            }
+
+        lines = [
+            "# HELP api_db_duration_seconds Time spent per query & phase "
+            "(connect, execute, fetch).",
+            "# TYPE api_db_duration_seconds histogram",
+        ]
+
+        for (query, phase), counts in sorted(histograms.items()):
+            labels = f'query="{query}",phase="{phase}"'
+            cumulative = 0
+
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(
+                    f'api_db_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                    f"{cumulative}"
+                )
+
+            lines.append(
+                f"api_db_duration_seconds_sum{{{labels}}} {sums[(query, phase)]}"
+            )
+            lines.append(f"api_db_duration_seconds_count{{{labels}}} {cumulative}")
+
+        for name, (description, values) in counters.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} counter")
+
+            for query, value in sorted(values.items()):
+                lines.append(f'{name}{{query="{query}"}} {value}')
+
+        return "\n".join(lines) + "\n"
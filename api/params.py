@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Query parameter parsing for RESTful API
+
+@Author: Luke Zaruba
+@Date: Oct 18, 2026
+@Version: 0.0.0
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Mapping
+
+from flask_restx import inputs, reqparse
+
+from db import COLUMNS
+
+# Extent Used when no Bounding Box is Given
+WORLD_BBOX = (-180.0, -90.0, 180.0, 90.0)
+
+
+def bbox(value: str) -> tuple:
+    """Parses a `xmin,ymin,xmax,ymax` bounding box in EPSG:4326."""
+    try:
+        xmin, ymin, xmax, ymax = (float(v) for v in value.split(","))
+    except ValueError:
+        raise ValueError("bbox must be four comma-separated numbers")
+
+    if xmin > xmax or ymin > ymax:
+        raise ValueError("bbox must be ordered xmin,ymin,xmax,ymax")
+
+    return xmin, ymin, xmax, ymax
+
+
+bbox.__schema__ = {"type": "string", "format": "xmin,ymin,xmax,ymax"}
+
+
+def fields(columns: list) -> Callable:
+    """Returns a parser for a comma-separated subset of `columns`."""
+
+    def parse(value: str) -> list:
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = [name for name in names if name not in columns]
+
+        if not names or unknown:
+            raise ValueError("fields must be drawn from " + ", ".join(columns))
+
+        return names
+
+    parse.__schema__ = {"type": "string", "format": "field,field,..."}
+
+    return parse
+
+
+def simplify_tolerance(zoom: int) -> float:
+    """Returns the size of one 256px web map tile pixel, in degrees, at a zoom."""
+    if zoom is None:
+        return 0.0
+
+    return 360.0 / (256 * 2**zoom)
+
+
+def bound_params(args: dict) -> dict:
+    """Builds the bound parameters for queries from `db.geojson_query`."""
+    xmin, ymin, xmax, ymax = args.get("bbox") or WORLD_BBOX
+
+    return {
+        "xmin": xmin,
+        "ymin": ymin,
+        "xmax": xmax,
+        "ymax": ymax,
+        "start": args.get("start"),
+        "end": args.get("end"),
+        "limit": args.get("limit"),
+        "tolerance": simplify_tolerance(args.get("zoom")),
+        "precision": 9 if args.get("precision") is None else args["precision"],
+        "fields": args.get("fields"),
+    }
+
+
+def geojson_parser(
+    table: str,
+    spatial: bool = False,
+    dated: bool = False,
+    zoom: bool = False,
+    topojson: bool = False,
+) -> reqparse.RequestParser:
+    """Builds the parser for a GeoJSON route reading from `table`."""
+    parser = reqparse.RequestParser()
+    parser.add_argument(
+        "stream",
+        type=inputs.boolean,
+        location="args",
+        default=False,
+        help="Stream features in batches instead of building the whole document.",
+    )
+    parser.add_argument(
+        "precision",
+        type=inputs.int_range(0, 15),
+        location="args",
+        help="Number of decimal digits kept in coordinates.",
+    )
+    parser.add_argument(
+        "fields",
+        type=fields(COLUMNS[table]),
+        location="args",
+        help="Comma-separated properties to include.",
+    )
+
+    if spatial:
+        parser.add_argument(
+            "bbox",
+            type=bbox,
+            location="args",
+            help="Only return features intersecting xmin,ymin,xmax,ymax (EPSG:4326).",
+        )
+        parser.add_argument(
+            "limit",
+            type=inputs.positive,
+            location="args",
+            help="Maximum number of features to return.",
+        )
+
+    if dated:
+        parser.add_argument(
+            "start",
+            type=inputs.date_from_iso8601,
+            location="args",
+            help="Only return incidents on or after this date (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "end",
+            type=inputs.date_from_iso8601,
+            location="args",
+            help="Only return incidents on or before this date (YYYY-MM-DD).",
+        )
+
+    if zoom:
+        parser.add_argument(
+            "zoom",
+            type=inputs.int_range(0, 24),
+            location="args",
+            help="Web map zoom level used to simplify polygons to one pixel of detail.",
+        )
+
+    if topojson:
+        parser.add_argument(
+            "format",
+            choices=("geojson", "topojson"),
+            location="args",
+            default="geojson",
+            help="Return GeoJSON, or TopoJSON with shared borders encoded once.",
+        )
+
+    return parser
+
+
+class ParamError(ValueError):
+    """
+    Raised when query parameters fail validation outside of a Flask request.
+    """
+
+    def __init__(self, errors: dict) -> None:
+        super().__init__("Input payload validation failed")
+        self.errors = errors
+
+
+def parse_args(parser: reqparse.RequestParser, args: Mapping) -> dict:
+    """Parses query string `args` with a parser, without a Flask request.
+
+    Mirrors `RequestParser.parse_args` for the single-valued query string
+    arguments used here, raising `ParamError` instead of aborting.
+    """
+    parsed = {}
+
+    for argument in parser.args:
+        value = args.get(argument.name)
+
+        if value is None:
+            parsed[argument.name] = argument.default
+            continue
+
+        # Same Error Messages as flask-restx
+        try:
+            parsed[argument.name] = argument.convert(value.strip(), "=")
+        except Exception as e:
+            error = f"{argument.help} {e}" if argument.help else str(e)
+            raise ParamError({argument.name: error})
+
+        if argument.choices and parsed[argument.name] not in argument.choices:
+            raise ParamError(
+                {
+                    argument.name: f"The value '{value}' is not a valid choice "
+                    f"for '{argument.name}'."
+                }
+            )
+
+    return parsed
+
+
+# GeoJSON Route Parameters
+incident_parser = geojson_parser("geo_accidents_mn", spatial=True, dated=True)
+ctu_parser = geojson_parser("ctu_accidents", spatial=True, zoom=True, topojson=True)
+current_cluster_parser = geojson_parser("crnt_clstr_ftprnt")
+yearly_cluster_parser = geojson_parser("clstr_ts_ftprnt")
+cluster_stability_parser = geojson_parser("clstr_union_ftprnt")
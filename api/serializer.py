@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+JSON serialization for RESTful API
+
+Uses orjson when it is installed, falling back to the standard library.
+
+@Author: Luke Zaruba
+@Date: Oct 18, 2026
+@Version: 0.0.0
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from flask.json.provider import JSONProvider as BaseJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(o):
+    # Same Conversions as Flask's Default JSON Provider
+    if isinstance(o, date):
+        return http_date(o)
+
+    if isinstance(o, (Decimal, uuid.UUID)):
+        return str(o)
+
+    # Typed Rows (NamedTuples) are Arrays, as in the Standard Library
+    if isinstance(o, tuple):
+        return list(o)
+
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+
+    def dumps(obj) -> bytes:
+        """Serializes `obj` to JSON bytes."""
+        return orjson.dumps(
+            obj, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME
+        )
+
+    loads = orjson.loads
+
+else:
+
+    def dumps(obj) -> bytes:
+        """Serializes `obj` to JSON bytes."""
+        return json.dumps(obj, default=_default).encode("utf-8")
+
+    loads = json.loads
+
+
+class JSONProvider(BaseJSONProvider):
+    """
+    A Flask JSON provider (used by `jsonify`) backed by `dumps` & `loads`.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        # Skip the Round Trip Through str
+        obj = self._prepare_response_obj(args, kwargs)
+
+        return self._app.response_class(dumps(obj), mimetype="application/json")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Production server for RESTful API
+
+Runs the async API (or the Flask API, with API_SERVER=wsgi) under gunicorn
+with multiple workers. The Swagger UI is only served by the Flask API:
+
+    python server.py
+
+Workers & their database pools are sized from API_DB_CONNECTIONS, the
+connections one instance may hold to each database (see `connection_budget`).
+
+@Author: Luke Zaruba
+@Date: Oct 18, 2026
+@Version: 0.0.0
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+
+from gunicorn.app.base import BaseApplication
+from gunicorn.util import import_app
+
+# Server -> (App, Worker Class)
+SERVERS = {
+    "asgi": ("asgi:app", "uvicorn.workers.UvicornWorker"),
+    "wsgi": ("app:app", "gthread"),
+}
+
+
+class Server(BaseApplication):
+    """
+    A gunicorn application loading the API from an import string.
+
+    With `preload_app`, the API module (and its settings, caches & database
+    handle) is imported once in the master process and shared by every
+    worker through fork; database pools are only opened inside workers.
+    """
+
+    def __init__(self, app_uri: str, options: dict = None) -> None:
+        self.app_uri = app_uri
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        return import_app(self.app_uri)
+
+
+def connection_budget() -> tuple:
+    """Returns the (workers, pool size) keeping an instance within its budget.
+
+    Each worker pools up to DB_POOL_MAX connections to the primary (and as many
+    to each read replica), so an instance holds up to workers x DB_POOL_MAX
+    connections per database. Whichever of API_WORKERS & DB_POOL_MAX is unset
+    is derived from API_DB_CONNECTIONS, the budget for those.
+    """
+    budget = int(os.environ.get("API_DB_CONNECTIONS", 20))
+
+    if "API_WORKERS" in os.environ:
+        workers = int(os.environ["API_WORKERS"])
+    else:
+        # Fewer Workers than CPUs Allow if Their Pools Would Exceed the Budget
+        pool_max = int(os.environ.get("DB_POOL_MAX", 10))
+        workers = min(multiprocessing.cpu_count() * 2 + 1, max(1, budget // pool_max))
+
+    if "DB_POOL_MAX" in os.environ:
+        pool_max = int(os.environ["DB_POOL_MAX"])
+    else:
+        pool_max = max(1, budget // workers)
+
+    return workers, pool_max
+
+
+def options_from_env() -> tuple:
+    """Reads the app & gunicorn settings from the environment."""
+    app_uri, worker_class = SERVERS[os.environ.get("API_SERVER", "asgi")]
+    workers, pool_max = connection_budget()
+
+    # Read by the App's Database Pools, Created in Each Worker
+    os.environ["DB_POOL_MAX"] = str(pool_max)
+
+    options = {
+        "bind": f"0.0.0.0:{os.environ.get('PORT', 8080)}",
+        "worker_class": worker_class,
+        "workers": workers,
+        # Threads per Worker (WSGI Only, Async Workers Interleave Requests)
+        "threads": int(os.environ.get("API_THREADS", 8)),
+        "preload_app": os.environ.get("API_PRELOAD", "true").lower() == "true",
+        # Seconds a Silent Worker Lives (0 Disables, Requests May Run Long)
+        "timeout": int(os.environ.get("API_TIMEOUT", 0)),
+        # Seconds Workers Get to Finish Requests on Restart/Shutdown
+        "graceful_timeout": int(os.environ.get("API_GRACEFUL_TIMEOUT", 30)),
+        # Seconds Idle Keep-Alive Connections are Held Open
+        "keepalive": int(os.environ.get("API_KEEPALIVE", 5)),
+        "accesslog": "-",
+    }
+
+    return app_uri, options
+
+
+if __name__ == "__main__":
+    app_uri, options = options_from_env()
+
+    Server(app_uri, options).run()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Pre-rendered, pre-compressed API payload snapshots.
+
+Run at the end of the pipeline (the workflow's publish step, after the
+analysis stage) to render every parameterless API payload once:
+
+    python snapshots.py [/path/to/snapshots]
+
+The directory defaults to API_SNAPSHOT_DIR. In deployment, a Cloud Storage
+bucket is mounted there on both the publishing job and the API service, and
+the API serves these files directly instead of querying the database. Each snapshot is stamped
+with the data versions it was rendered from; once the pipeline bumps a
+version, the route falls back to the database until snapshots are published
+again.
+
+@Author: Luke Zaruba
+@Date: Oct 18, 2026
+@Version: 0.0.0
+"""
+
+from __future__ import annotations
+
+import functools
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable
+
+from flask import Response, request, send_file
+
+from cache import DataVersions
+from db import Database, Query
+import serializer
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Snapshot Name -> (Query, Shape of Payload, Tables Read)
+# "text" payloads are JSON text rendered by PostgreSQL, passed through as-is,
+# "document" payloads are the first column of the first row,
+# "rows" payloads are every row (as returned by the metrics routes)
+SNAPSHOTS = {
+    "incidents/geojson": (Query.INCIDENT_GEOJSON, "text", ("geo_accidents_mn",)),
+    "incidents/total": (Query.INCIDENT_TOTAL, "document", ("raw_accidents",)),
+    "incidents/last-week": (
+        Query.INCIDENT_LAST_WEEK,
+        "document",
+        ("glb_wk_time_series",),
+    ),
+    "incidents/crnt-clstr-ftprnt": (
+        Query.INCIDENT_CURRENT_CLUSTERS,
+        "text",
+        ("crnt_clstr_ftprnt",),
+    ),
+    "incidents/yrly-clstr-ftprnt": (
+        Query.INCIDENT_YEARLY_CLUSTERS,
+        "text",
+        ("clstr_ts_ftprnt",),
+    ),
+    "incidents/clstr-ftprnt-stblty": (
+        Query.INCIDENT_CLUSTER_STABILITY,
+        "text",
+        ("clstr_union_ftprnt",),
+    ),
+    "ctu/geojson": (Query.CTU_GEOJSON, "text", ("ctu_accidents",)),
+    "metrics/alcohol": (Query.METRICS_ALCOHOL, "rows", ("metric_rollups",)),
+    "metrics/seatbelt": (Query.METRICS_SEATBELT, "rows", ("metric_rollups",)),
+    "metrics/helmet": (Query.METRICS_HELMET, "rows", ("metric_rollups",)),
+    "metrics/condition": (Query.METRICS_CONDITION, "rows", ("metric_rollups",)),
+    "metrics/accident-type": (Query.METRICS_TYPE, "rows", ("metric_rollups",)),
+    "metrics/timeseries": (Query.METRICS_TIMESERIES, "rows", ("glb_wk_time_series",)),
+    "metrics/vehicle-count": (Query.METRICS_VEHICLE_COUNT, "rows", ("metric_rollups",)),
+    "metrics/summary": (
+        Query.METRICS_SUMMARY,
+        "text",
+        ("metric_rollups", "glb_wk_time_series"),
+    ),
+}
+
+MANIFEST = "manifest.json"
+
+
+def render(db: Database, name: str) -> bytes:
+    """Renders a snapshot's payload the same way its route would."""
+    query, shape, _ = SNAPSHOTS[name]
+
+    return encode(db.query(query), shape)
+
+
+def encode(out: list, shape: str) -> bytes:
+    """Serializes query output shaped as "text", a "document" or as "rows"."""
+    if shape == "text":
+        # Never Parsed in Python
+        return out[0][0].encode("utf-8")
+
+    if shape == "document":
+        return serializer.dumps(out[0][0])
+
+    # Same Encoding as jsonify, Including Dates
+    return serializer.dumps(out)
+
+
+def publish(db: Database, directory: str) -> dict:
+    """Renders & compresses every snapshot, then swaps in a new manifest."""
+    os.makedirs(directory, exist_ok=True)
+
+    # Read Versions Before Rendering, so a Concurrent Pipeline Run Can Only
+    # Make a Snapshot Look Stale, Never Fresh
+    versions = DataVersions(db)
+    versions.refresh()
+
+    manifest = {}
+
+    for name, (_, _, tables) in SNAPSHOTS.items():
+        body = render(db, name)
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        stem = f"{name.replace('/', '-')}.{digest}.json"
+
+        # Identity, Gzip & (if Available) Brotli Encodings
+        encodings = {
+            "identity": (stem, body),
+            "gzip": (stem + ".gz", gzip.compress(body, compresslevel=9, mtime=0)),
+        }
+
+        if brotli is not None:
+            encodings["br"] = (stem + ".br", brotli.compress(body, quality=11))
+
+        for filename, data in encodings.values():
+            _write_atomic(os.path.join(directory, filename), data)
+
+        manifest[name] = {
+            "hash": digest,
+            "version": versions.stamp(*tables),
+            "files": {enc: filename for enc, (filename, _) in encodings.items()},
+        }
+
+    _write_atomic(
+        os.path.join(directory, MANIFEST),
+        json.dumps(manifest, indent=2).encode("utf-8"),
+    )
+
+    # Remove Files from Previous Runs
+    current = {f for entry in manifest.values() for f in entry["files"].values()}
+
+    current.add(MANIFEST)
+
+    for filename in os.listdir(directory):
+        if filename.endswith((".json", ".gz", ".br")) and filename not in current:
+            os.remove(os.path.join(directory, filename))
+
+    return manifest
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    # Write to Temp File & Rename so Readers Never See Partial Files
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+        os.replace(tmp_path, path)
+
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class SnapshotStore:
+    """
+    Serves published snapshots, picking the best encoding the client accepts.
+
+    Used as a decorator on routes; when no directory is configured, or a
+    request has query parameters, or a snapshot is missing or older than the
+    current data version, the route runs as normal.
+    """
+
+    def __init__(
+        self, directory: str = None, versions: DataVersions = None, ttl: float = 5.0
+    ) -> None:
+        self.directory = directory
+        self.versions = versions
+        self.ttl = ttl
+
+        self._manifest = {}
+        self._mtime = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def __call__(self, name: str) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if self.directory and not request.args:
+                    out = self.serve(name)
+
+                    if out is not None:
+                        return out
+
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def select(self, name: str, accepts: Callable[[str], bool]) -> tuple:
+        """Returns the (ETag, encoding, path) of the best file for a client.
+
+        `accepts` tells whether the client accepts a content encoding. Returns
+        None when there is no current snapshot called `name`.
+        """
+        entry = self._current().get(name)
+
+        if entry is None:
+            return None
+
+        # Stale Once the Pipeline Bumps a Table the Snapshot Reads
+        if self.versions is not None:
+            _, _, tables = SNAPSHOTS[name]
+
+            if entry.get("version") != self.versions.stamp(*tables):
+                return None
+
+        # Prefer Brotli, then Gzip, then Uncompressed
+        encoding = "identity"
+
+        for candidate in ("br", "gzip"):
+            if candidate in entry["files"] and accepts(candidate):
+                encoding = candidate
+                break
+
+        etag = (
+            entry["hash"] if encoding == "identity" else f"{entry['hash']}-{encoding}"
+        )
+
+        return etag, encoding, os.path.join(self.directory, entry["files"][encoding])
+
+    def serve(self, name: str) -> Response:
+        selected = self.select(name, lambda enc: bool(request.accept_encodings[enc]))
+
+        if selected is None:
+            return None
+
+        etag, encoding, path = selected
+
+        if request.if_none_match.contains(etag):
+            out = Response(status=304)
+        else:
+            try:
+                out = send_file(
+                    path, mimetype="application/json", conditional=False, etag=False
+                )
+            except FileNotFoundError:
+                return None
+
+            # Served Inline, not as a Download
+            del out.headers["Content-Disposition"]
+
+            if encoding != "identity":
+                out.headers["Content-Encoding"] = encoding
+
+        out.headers["ETag"] = f'"{etag}"'
+        out.headers["Cache-Control"] = "no-cache"
+        out.headers["Vary"] = "Accept-Encoding"
+
+        return out
+
+    def _current(self) -> dict:
+        with self._lock:
+            # Check for a New Manifest at Most Once per TTL
+            if (
+                self._checked_at is None
+                or time.monotonic() - self._checked_at >= self.ttl
+            ):
+                self._checked_at = time.monotonic()
+                path = os.path.join(self.directory, MANIFEST)
+
+                try:
+                    mtime = os.path.getmtime(path)
+
+                    if mtime != self._mtime:
+                        with open(path, "rb") as f:
+                            self._manifest = json.load(f)
+                        self._mtime = mtime
+
+                except (OSError, ValueError):
+                    self._manifest = {}
+                    self._mtime = None
+
+            return self._manifest
+
+
+if __name__ == "__main__":
+    # Output Directory from Argument or Environment
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.environ["API_SNAPSHOT_DIR"]
+
+    db = Database.initialize_from_env()
+    manifest = publish(db, directory)
+    db.close()
+
+    print(json.dumps({name: entry["hash"] for name, entry in manifest.items()}))
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+TopoJSON encoding for polygon GeoJSON output
+
+@Author: Luke Zaruba
+@Date: Oct 18, 2026
+@Version: 0.0.0
+"""
+
+from __future__ import annotations
+
+
+def to_topojson(collection: dict, object_name: str, quantization: int = 100000) -> dict:
+    """Encodes a FeatureCollection of (multi)polygons as a quantized TopoJSON.
+
+    Rings are cut into arcs wherever neighbouring polygons meet, and each arc
+    is stored once, so borders shared by two polygons are only encoded once.
+
+    Args:
+        collection (dict): GeoJSON FeatureCollection of Polygons/MultiPolygons.
+        object_name (str): Name of the geometry collection in the topology.
+        quantization (int): Number of distinct positions along each axis.
+
+    Returns:
+        dict: TopoJSON Topology.
+    """
+    features = collection.get("features") or []
+
+    # Bounding Box of All Coordinates
+    points = [
+        point
+        for feature in features
+        for polygon in _polygons(feature.get("geometry"))
+        for ring in polygon
+        for point in ring
+    ]
+
+    if points:
+        x0, y0 = min(p[0] for p in points), min(p[1] for p in points)
+        x1, y1 = max(p[0] for p in points), max(p[1] for p in points)
+    else:
+        x0 = y0 = x1 = y1 = 0.0
+
+    kx = (x1 - x0) / (quantization - 1) or 1.0
+    ky = (y1 - y0) / (quantization - 1) or 1.0
+
+    # Quantize Every Ring
+    geometries = []
+
+    for feature in features:
+        polygons = [
+            [
+                ring
+                for ring in (_quantize(r, x0, y0, kx, ky) for r in polygon)
+                if len(ring) >= 4
+            ]
+            for polygon in _polygons(feature.get("geometry"))
+        ]
+        geometries.append((feature, polygons))
+
+    rings = [
+        ring for _, polygons in geometries for polygon in polygons for ring in polygon
+    ]
+    junctions = _find_junctions(rings)
+
+    # Cut Rings into Arcs & Store Each Arc Once
+    arcs = []
+    arc_index = {}
+
+    def add_arc(arc: list) -> int:
+        key = tuple(arc)
+
+        if key in arc_index:
+            return arc_index[key]
+
+        reversed_key = tuple(reversed(arc))
+
+        if reversed_key in arc_index:
+            # Negative Indices Reference Arcs Traversed Backwards
+            return ~arc_index[reversed_key]
+
+        arc_index[key] = len(arcs)
+        arcs.append(arc)
+
+        return arc_index[key]
+
+    out_geometries = []
+
+    for feature, polygons in geometries:
+        arc_polygons = [
+            [[add_arc(arc) for arc in _cut_ring(ring, junctions)] for ring in polygon]
+            for polygon in polygons
+        ]
+
+        geometry = {"properties": feature.get("properties") or {}}
+
+        if "id" in feature:
+            geometry["id"] = feature["id"]
+
+        if not arc_polygons:
+            geometry["type"] = None
+        elif len(arc_polygons) == 1:
+            geometry["type"] = "Polygon"
+            geometry["arcs"] = arc_polygons[0]
+        else:
+            geometry["type"] = "MultiPolygon"
+            geometry["arcs"] = arc_polygons
+
+        out_geometries.append(geometry)
+
+    return {
+        "type": "Topology",
+        "bbox": [x0, y0, x1, y1],
+        "transform": {"scale": [kx, ky], "translate": [x0, y0]},
+        "objects": {
+            object_name: {"type": "GeometryCollection", "geometries": out_geometries}
+        },
+        "arcs": [_delta_encode(arc) for arc in arcs],
+    }
+
+
+def _polygons(geometry: dict) -> list:
+    if not geometry:
+        return []
+
+    if geometry["type"] == "Polygon":
+        return [geometry["coordinates"]]
+
+    if geometry["type"] == "MultiPolygon":
+        return geometry["coordinates"]
+
+    return []
+
+
+def _quantize(ring: list, x0: float, y0: float, kx: float, ky: float) -> list:
+    quantized = []
+
+    for x, y, *_ in ring:
+        point = (round((x - x0) / kx), round((y - y0) / ky))
+
+        # Drop Points Collapsed onto their Predecessor
+        if not quantized or quantized[-1] != point:
+            quantized.append(point)
+
+    return quantized
+
+
+def _find_junctions(rings: list) -> set:
+    # A Point is a Junction if Rings Pass Through it with Different Neighbours
+    neighbours = {}
+    junctions = set()
+
+    for ring in rings:
+        # Rings are Closed, so Skip the Repeated Last Point
+        n = len(ring) - 1
+
+        for i in range(n):
+            point = ring[i]
+            pair = frozenset((ring[i - 1 if i else n - 1], ring[(i + 1) % n]))
+
+            if point not in neighbours:
+                neighbours[point] = pair
+            elif neighbours[point] != pair:
+                junctions.add(point)
+
+    return junctions
+
+
+def _cut_ring(ring: list, junctions: set) -> list:
+    ring = ring[:-1]
+    cuts = [i for i, point in enumerate(ring) if point in junctions]
+
+    if not cuts:
+        # Closed Arc, Rotated to a Canonical Start so Duplicates Line Up
+        start = ring.index(min(ring))
+        arc = ring[start:] + ring[:start] + [ring[start]]
+
+        return [arc]
+
+    # Start at the First Junction & Split at Every Other Junction
+    start = cuts[0]
+    rotated = ring[start:] + ring[:start] + [ring[start]]
+
+    arcs = []
+    arc = [rotated[0]]
+
+    for point in rotated[1:]:
+        arc.append(point)
+
+        if point in junctions:
+            arcs.append(arc)
+            arc = [point]
+
+    return arcs
+
+
+def _delta_encode(arc: list) -> list:
+    encoded = [list(arc[0])]
+
+    for (px, py), (x, y) in zip(arc, arc[1:]):
+        encoded.append([x - px, y - py])
+
+    return encoded
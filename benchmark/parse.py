@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Parse-only benchmark for the scraper's incident page parsers.
+
+Runs every installed parser (see `PARSERS` in `functions/web_scraping.py`)
+over the same incident pages, without network access, and prints pages per
+second, time per page & speedup over html.parser as JSON. Each parser's
+output is checked against html.parser's, so a faster parser that extracts
+different values is reported as a mismatch.
+
+Pages are read from saved HTML fixtures, or generated when no fixtures are
+given. To save real pages first:
+
+    python benchmark/parse.py --save 123456 123457 --fixtures fixtures/
+    python benchmark/parse.py --fixtures fixtures/ --output parse.json
+
+@Author: Luke Zaruba
+@Date: Oct 18, 2026
+@Version: 0.0.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "functions"))
+
+import web_scraping  # noqa: E402
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<title>MSP Incident Display</title>
+<link href="/MSPMedia2/Content/bootstrap.css" rel="stylesheet"/>
+<script src="/MSPMedia2/Scripts/jquery.js"></script>
+</head>
+<body>
+<div class="navbar navbar-inverse navbar-fixed-top">
+<ul class="nav navbar-nav">{nav}</ul>
+</div>
+<div class="container body-content">
+<strong>State Patrol Incident Report</strong>
+<div class="row">
+<div class="col-md-1 col-xs-5"><label>Type</label></div>
+<div class="col-md-1 col-xs-7">{incident_type}</div>
+<div class="col-md-1 col-xs-4"><label>ICR</label></div>
+<div class="col-md-2 col-xs-2">{icr}</div>
+<div class="col-md-1 col-xs-4"><label>Date</label></div>
+<div class="col-md-2 col-xs-8">{date}</div>
+<div class="col-md-2 col-xs-3"><label>District</label></div>
+<div class="col-md-2 col-xs-9">{district}</div>
+</div>
+<div class="row">
+<div class="col-md-2 col-xs-4"><label>Road Condition</label></div>
+<div class="col-md-2 col-xs-4">{condition}</div>
+<div class="col-md-8 col-xs-12">{location}</div>
+</div>
+<div class="row"><strong>{num_vehicles} Vehicles Involved</strong></div>
+{vehicles}
+</div>
+<footer><p>&copy; Minnesota Department of Public Safety</p></footer>
+</body>
+</html>
+"""
+
+VEHICLE = """<div class="row vehicle">
+<div class="col-md-12 col-xs-12">{vehicle}</div>
+<div class="col-md-1 col-xs-2"><label>Airbag</label> {airbag}</div>
+{people}
+</div>
+"""
+
+PERSON = """<div class="row person">
+<div class="col-md-12 col-xs-12">{name}</div>
+<div class="col-md-12 col-xs-12">{residence}</div>
+<div class="col-md-12 col-xs-12">{gender} Age: {age}</div>
+<div class="person-role">{role}</div>
+<div class="col-md-2 col-xs-6">{injury}</div>
+<div class="col-md-2 col-xs-6">{helmet}</div>
+<div class="col-md-2 col-xs-8">{seatbelt}</div>
+<div class="col-md-3 col-xs-2">{alcohol}</div>
+</div>
+"""
+
+
+def synthetic_page(icr: int, vehicles: int, rng: random.Random) -> str:
+    """Generates an incident page with the DPS site's layout & class names."""
+    vehicle_html = []
+
+    for v in range(1, vehicles + 1):
+        people = []
+
+        for p in range(rng.randint(1, 4)):
+            people.append(
+                PERSON.format(
+                    name=f"Person {icr}-{v}-{p}",
+                    residence=rng.choice(["Minneapolis, MN", "St Paul, MN", "Unknown"]),
+                    gender=rng.choice(["Male", "Female"]),
+                    age=rng.randint(1, 90),
+                    role="Driver" if p == 0 else "Passenger",
+                    injury=rng.choice(["No Apparent Injury", "Possible", "Fatal"]),
+                    helmet="N/A",
+                    seatbelt=rng.choice(["Yes", "No", "Unknown"]),
+                    alcohol=rng.choice(["Not Applicable", "Yes", "No"]),
+                )
+            )
+
+        vehicle_html.append(
+            VEHICLE.format(
+                vehicle=f"{v} {rng.randint(1990, 2026)} Vehicle &amp; Trailer",
+                airbag=rng.choice(["Deployed", "Not Deployed"]),
+                people="".join(people),
+            )
+        )
+
+    return PAGE.format(
+        nav="".join(
+            f'<li><a href="/MSPMedia2/Page/{i}">Link {i}</a></li>' for i in range(50)
+        ),
+        incident_type="Crash",
+        icr=icr,
+        date=f"10/{rng.randint(1, 28):02d}/2026 {rng.randint(0, 23):02d}:00",
+        district=rng.choice(["Golden Valley", "Rochester", "Duluth"]),
+        condition=rng.choice(["Dry", "Wet", "Snow/Ice"]),
+        location="I-94 EB at Hwy 280",
+        num_vehicles=vehicles,
+        vehicles="".join(vehicle_html),
+    )
+
+
+def load_fixtures(fixtures: str) -> list:
+    pages = []
+
+    for path in sorted(glob.glob(os.path.join(fixtures, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            pages.append(f.read())
+
+    return pages
+
+
+def save_fixtures(record_ids: list, fixtures: str) -> None:
+    """Downloads incident pages into `fixtures`, one file per record ID."""
+    os.makedirs(fixtures, exist_ok=True)
+    session = web_scraping.create_session()
+
+    for record_id in record_ids:
+        html = web_scraping.fetch_page(
+            session, f"https://app.dps.mn.gov/MSPMedia2/IncidentDisplay/{record_id}"
+        )
+
+        with open(
+            os.path.join(fixtures, f"{record_id}.html"), "w", encoding="utf-8"
+        ) as f:
+            f.write(html)
+
+
+def parse_all(parser: str, pages: list) -> tuple:
+    """Parses every page, returning the elapsed seconds & extracted values."""
+    scraper = web_scraping.ScrapeRecords([], parser=parser)
+    people = []
+
+    start = time.perf_counter()
+
+    for html in pages:
+        try:
+            people.append(scraper.parse(html))
+        except Exception as e:
+            people.append(repr(e))
+
+    elapsed = time.perf_counter() - start
+
+    incidents = [
+        scraper._incident_type,
+        scraper._incident_icr,
+        scraper._incident_date,
+        scraper._incident_district,
+        scraper._incident_location,
+        scraper._incident_condition,
+        scraper._incident_num_vehicles,
+    ]
+    return elapsed, (incidents, people)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--fixtures", default=None, help="directory of saved *.html incident pages"
+    )
+    parser.add_argument(
+        "--save", nargs="+", default=None, help="record IDs to download into --fixtures"
+    )
+    parser.add_argument(
+        "--pages", type=int, default=500, help="synthetic pages, without --fixtures"
+    )
+    parser.add_argument("--max-vehicles", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5, help="runs, best is kept")
+    parser.add_argument("--output", default=None, help="write JSON here (stdout)")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.save:
+        if not args.fixtures:
+            sys.exit("--save requires --fixtures")
+
+        save_fixtures(args.save, args.fixtures)
+
+    if args.fixtures:
+        pages = load_fixtures(args.fixtures)
+    else:
+        rng = random.Random(args.seed)
+        pages = [
+            synthetic_page(icr, rng.randint(1, args.max_vehicles), rng)
+            for icr in range(args.pages)
+        ]
+
+    if not pages:
+        sys.exit("No pages to parse")
+
+    parsers = [name for name, page in web_scraping.PARSERS.items() if page.available()]
+    _, baseline = parse_all("html.parser", pages)
+    results = {}
+
+    for name in parsers:
+        runs = [parse_all(name, pages) for _ in range(args.repeat)]
+        elapsed = min(run[0] for run in runs)
+
+        results[name] = {
+            "pages_per_s": round(len(pages) / elapsed, 1),
+            "ms_per_page": round(elapsed / len(pages) * 1000, 3),
+            "matches_html_parser": runs[0][1] == baseline,
+        }
+
+    for result in results.values():
+        result["speedup"] = round(
+            results["html.parser"]["ms_per_page"] / result["ms_per_page"], 2
+        )
+
+    report = {
+        "pages": len(pages),
+        "source": args.fixtures or "synthetic",
+        "bytes": round(sum(map(len, pages)) / len(pages)),
+        "parsers": results,
+    }
+
+    out = json.dumps(report, indent=2, sort_keys=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
@@ -0,0 +1,341 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Load test & latency benchmark for the RESTful API.
+
+Loads a synthetic dataset into a local PostGIS database, starts the API with
+`api/server.py`, drives every route at a fixed concurrency and prints p50,
+p95 & p99 latency, throughput and payload size per route as JSON, so runs
+can be diffed between commits:
+
+    docker run -d -p 5432:5432 -e POSTGRES_PASSWORD=bench postgis/postgis
+    python benchmark/run.py --load --output bench.json \\
+        --dsn "host=localhost user=postgres password=bench dbname=postgres"
+
+@Author: Luke Zaruba
+@Date: Oct 18, 2026
+@Version: 0.0.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import psycopg2
+from psycopg2.extensions import parse_dsn
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(ROOT, "api")
+
+# Route Name -> Path (Relative to /api/v1)
+ROUTES = {
+    "incidents/geojson": "/incidents/geojson",
+    "incidents/geojson?bbox": "/incidents/geojson?bbox=-93.5,44.8,-93.0,45.1",
+    "incidents/geojson?dates": "/incidents/geojson?start=2022-01-01&end=2022-12-31",
+    "incidents/geojson?stream": "/incidents/geojson?stream=true",
+    "incidents/<icr>": "/incidents/1",
+    "incidents/total": "/incidents/total",
+    "incidents/last-week": "/incidents/last-week",
+    "incidents/crnt-clstr-ftprnt": "/incidents/crnt-clstr-ftprnt",
+    "incidents/yrly-clstr-ftprnt": "/incidents/yrly-clstr-ftprnt",
+    "incidents/clstr-ftprnt-stblty": "/incidents/clstr-ftprnt-stblty",
+    "ctu/geojson": "/ctu/geojson",
+    "ctu/geojson?zoom": "/ctu/geojson?zoom=8&fields=id,total_incident_count",
+    "ctu/geojson?topojson": "/ctu/geojson?format=topojson",
+    "metrics/alcohol": "/metrics/alcohol",
+    "metrics/seatbelt": "/metrics/seatbelt",
+    "metrics/helmet": "/metrics/helmet",
+    "metrics/condition": "/metrics/condition",
+    "metrics/accident-type": "/metrics/accident-type",
+    "metrics/timeseries": "/metrics/timeseries",
+    "metrics/vehicle-count": "/metrics/vehicle-count",
+    "metrics/summary": "/metrics/summary",
+    # Zoom 6 Tile Covering Central Minnesota
+    "tiles/incidents": "/tiles/incidents/6/15/22.pbf",
+    "tiles/ctu": "/tiles/ctu/6/15/22.pbf",
+}
+
+# Routes Only Served by the Flask API
+WSGI_ONLY = {"tiles/incidents", "tiles/ctu"}
+
+
+def load_dataset(dsn: str, incidents: int, people: int, clusters: int, seed: float):
+    """Creates the schema & (re)loads the synthetic dataset."""
+    side = max(1, round(math.sqrt(incidents / 50)))
+
+    with open(os.path.join(ROOT, "database", "schemas.sql")) as f:
+        schema = f.read()
+
+    with open(os.path.join(ROOT, "benchmark", "synthetic.sql")) as f:
+        synthetic = f.read()
+
+    connection = psycopg2.connect(dsn)
+
+    try:
+        with connection.cursor() as c:
+            c.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+            c.execute(schema)
+            c.execute(
+                synthetic,
+                {
+                    "seed": seed,
+                    "incidents": incidents,
+                    "people": people,
+                    "side": side,
+                    "clusters": clusters,
+                },
+            )
+        connection.commit()
+
+    finally:
+        connection.close()
+
+
+def start_server(dsn: str, args: argparse.Namespace) -> subprocess.Popen:
+    """Starts the API with the production launcher & waits until it answers."""
+    params = parse_dsn(dsn)
+    env = dict(
+        os.environ,
+        DB_HOST=params.get("host", "localhost"),
+        DB_PORT=params.get("port", "5432"),
+        DB_USER=params.get("user", ""),
+        DB_PASSWORD=params.get("password", ""),
+        DB_NAME=params.get("dbname", ""),
+        PORT=str(args.port),
+        API_SERVER=args.server,
+        API_WORKERS=str(args.workers),
+    )
+
+    # Render Every Request from the Database
+    if args.cold:
+        env["API_CACHE_MAX_BYTES"] = "0"
+
+    server = subprocess.Popen(
+        [sys.executable, "server.py"],
+        cwd=API_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 60
+
+    while time.monotonic() < deadline:
+        try:
+            status, _ = request("localhost", args.port, "/api/v1/incidents/total")
+            if status == 200:
+                return server
+        except OSError:
+            pass
+
+        time.sleep(0.5)
+
+    server.terminate()
+    raise RuntimeError("API did not start within 60 seconds")
+
+
+def request(
+    host: str, port: int, path: str, headers: dict = None, connection=None
+) -> tuple:
+    """Sends a GET request, returning the status & body length in bytes."""
+    conn = connection or http.client.HTTPConnection(host, port, timeout=120)
+
+    try:
+        conn.request("GET", path, headers=headers or {})
+        response = conn.getresponse()
+
+        return response.status, len(response.read())
+
+    finally:
+        if connection is None:
+            conn.close()
+
+
+def drive(path: str, args: argparse.Namespace) -> dict:
+    """Sends `args.requests` requests to `path` from `args.concurrency` clients."""
+    headers = {"Accept-Encoding": args.encoding} if args.encoding else {}
+    latencies = []
+    sizes = []
+    errors = 0
+    remaining = [args.requests]
+    lock = threading.Lock()
+
+    def client():
+        nonlocal errors
+
+        # One Keep-Alive Connection per Client
+        conn = http.client.HTTPConnection("localhost", args.port, timeout=120)
+
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+
+            start = time.perf_counter()
+
+            try:
+                status, size = request("localhost", args.port, path, headers, conn)
+            except (OSError, http.client.HTTPException):
+                status, size = None, 0
+                conn.close()
+                conn = http.client.HTTPConnection("localhost", args.port, timeout=120)
+
+            elapsed = time.perf_counter() - start
+
+            with lock:
+                if status == 200:
+                    latencies.append(elapsed)
+                    sizes.append(size)
+                else:
+                    errors += 1
+
+        conn.close()
+
+    # Warm Up Caches & Connection Pools
+    for _ in range(args.warmup):
+        request("localhost", args.port, path, headers)
+
+    threads = [threading.Thread(target=client) for _ in range(args.concurrency)]
+    start = time.perf_counter()
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - start
+
+    return summarize(latencies, sizes, errors, elapsed)
+
+
+def summarize(latencies: list, sizes: list, errors: int, elapsed: float) -> dict:
+    out = {"requests": len(latencies) + errors, "errors": errors}
+
+    if len(latencies) < 2:
+        return out
+
+    # Percentile Cut Points 1..99
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+
+    out.update(
+        {
+            "p50_ms": round(cuts[49] * 1000, 3),
+            "p95_ms": round(cuts[94] * 1000, 3),
+            "p99_ms": round(cuts[98] * 1000, 3),
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "bytes": round(statistics.fmean(sizes)),
+        }
+    )
+
+    return out
+
+
+def commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--dsn",
+        default=os.environ.get("BENCH_DSN", "host=localhost dbname=postgres"),
+        help="libpq connection string of the benchmark database",
+    )
+    parser.add_argument(
+        "--load", action="store_true", help="(re)load the synthetic dataset first"
+    )
+    parser.add_argument("--incidents", type=int, default=100000)
+    parser.add_argument("--people", type=int, default=2, help="people per incident")
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--seed", type=float, default=0.42)
+    parser.add_argument("--server", choices=("asgi", "wsgi"), default="wsgi")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--requests", type=int, default=200, help="measured requests per route"
+    )
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument(
+        "--encoding", default="gzip", help="Accept-Encoding sent by clients"
+    )
+    parser.add_argument(
+        "--cold", action="store_true", help="disable the API's response cache"
+    )
+    parser.add_argument(
+        "--routes", nargs="*", default=None, help="route names to drive (all)"
+    )
+    parser.add_argument("--output", default=None, help="write JSON here (stdout)")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.load:
+        load_dataset(args.dsn, args.incidents, args.people, args.clusters, args.seed)
+
+    routes = {
+        name: path
+        for name, path in ROUTES.items()
+        if (args.routes is None or name in args.routes)
+        and (args.server == "wsgi" or name not in WSGI_ONLY)
+    }
+
+    server = start_server(args.dsn, args)
+
+    try:
+        results = {name: drive("/api/v1" + path, args) for name, path in routes.items()}
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        "commit": commit(),
+        "config": {
+            key: getattr(args, key)
+            for key in (
+                "incidents",
+                "people",
+                "clusters",
+                "seed",
+                "server",
+                "workers",
+                "concurrency",
+                "requests",
+                "encoding",
+                "cold",
+            )
+        },
+        "routes": results,
+    }
+
+    out = json.dumps(report, indent=2, sort_keys=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
@@ -0,0 +1,178 @@
+-- Synthetic dataset for API benchmarks, loaded by run.py after schemas.sql
+-- Parameters: %(seed)s, %(incidents)s, %(people)s (per incident),
+-- %(side)s (CTU grid is side x side) & %(clusters)s
+-- Extent roughly covers Minnesota: -97.2..-89.5, 43.5..49.4
+
+SELECT setseed(%(seed)s);
+
+TRUNCATE raw_accidents, raw_people, geo_accidents, geo_accidents_mn, ctu,
+ctu_accidents, crnt_clstr_ftprnt, clstr_ts_ftprnt, clstr_union_ftprnt,
+glb_wk_time_series, metric_rollups, metric_rollup_icrs, data_version
+RESTART IDENTITY;
+
+-- CTUs, a Grid of Rectangles
+INSERT INTO ctu_accidents (
+    ctu_name, class, county, pop, total_road_length, aadt_sum, aadt_mean,
+    total_incident_count, predicted_count, lmi_i, lmi_q, lmi_p, lmi_sig,
+    lmi_label, geom
+)
+SELECT 'CTU ' || i || '-' || j,
+(ARRAY['CITY', 'TOWNSHIP', 'UNORGANIZED'])[1 + floor(random() * 3)::int],
+'County ' || (1 + (i * %(side)s + j) %% 87),
+floor(random() * 50000)::int,
+random() * 500,
+random() * 1000000,
+random() * 10000,
+0,
+random() * 100,
+random() * 2 - 1,
+1 + floor(random() * 4)::int,
+random(),
+(random() > 0.9)::int,
+(ARRAY['Not Significant', 'High-High', 'Low-Low', 'High-Low', 'Low-High'])[
+    1 + floor(random() * 5)::int
+],
+ST_MakeEnvelope(
+    -97.2 + i * 7.7 / %(side)s,
+    43.5 + j * 5.9 / %(side)s,
+    -97.2 + (i + 1) * 7.7 / %(side)s,
+    43.5 + (j + 1) * 5.9 / %(side)s,
+    4326
+)
+FROM generate_series(0, %(side)s - 1) i, generate_series(0, %(side)s - 1) j;
+
+INSERT INTO ctu (
+    id, ctu_name, class, county, pop, total_road_length, aadt_sum, aadt_mean, geom
+)
+SELECT id, ctu_name, class, county, pop, total_road_length, aadt_sum, aadt_mean, geom
+FROM ctu_accidents;
+
+-- Incidents
+INSERT INTO raw_accidents (
+    icr, incident_type, incident_date, district, location_description,
+    road_condition, vehicles_involved
+)
+SELECT i,
+(ARRAY['Property Damage', 'Personal Injury', 'Fatal'])[1 + floor(random() * 3)::int],
+timestamp '2017-01-01' + random() * (timestamp '2023-09-01' - timestamp '2017-01-01'),
+'District ' || (1 + floor(random() * 10)::int),
+'Synthetic location ' || i,
+(ARRAY['Dry', 'Wet', 'Snow/Slush', 'Ice/Frost', ''])[1 + floor(random() * 5)::int],
+1 + floor(random() * 4)::int
+FROM generate_series(1, %(incidents)s) i;
+
+INSERT INTO raw_people (
+    person_name, vehicle, residence, person_role, injury, helmet, seatbelt,
+    alcohol, icr, gender, age
+)
+SELECT 'Person ' || p,
+'Vehicle ' || p,
+'Synthetic residence',
+(ARRAY['Driver', 'Passenger'])[1 + floor(random() * 2)::int],
+(ARRAY['No Apparent Injury', 'Possible', 'Minor', 'Serious', 'Fatal'])[
+    1 + floor(random() * 5)::int
+],
+(ARRAY['Not Applicable', 'Helmet Used', 'No Helmet Used'])[1 + floor(random() * 3)::int],
+(ARRAY['Yes', 'No'])[1 + floor(random() * 2)::int],
+(ARRAY['No', 'Yes', 'Pending'])[1 + floor(random() * 3)::int],
+a.icr,
+(ARRAY['Male', 'Female'])[1 + floor(random() * 2)::int],
+16 + floor(random() * 70)::int
+FROM raw_accidents a, generate_series(1, %(people)s) p;
+
+INSERT INTO geo_accidents (
+    icr, incident_type, incident_date, district, location_description,
+    road_condition, vehicles_involved, x, y, geom, city_id
+)
+SELECT a.*, pt.x, pt.y, ST_SetSRID(ST_MakePoint(pt.x, pt.y), 4326), NULL
+FROM raw_accidents a,
+LATERAL (
+    -- Referencing the Outer Row Draws a New Point per Incident
+    SELECT -97.2 + random() * 7.7 + a.icr * 0 AS x,
+    43.5 + random() * 5.9 AS y
+) pt;
+
+INSERT INTO geo_accidents_mn
+SELECT acc.icr, acc.incident_type, acc.incident_date, acc.district,
+acc.location_description, acc.road_condition, acc.vehicles_involved, acc.x,
+acc.y, acc.geom, ctu.id
+FROM geo_accidents acc
+JOIN ctu
+ON ST_Intersects(ctu.geom, acc.geom);
+
+UPDATE ctu_accidents
+SET total_incident_count = counts.n
+FROM (
+    SELECT city_id, COUNT(*) AS n
+    FROM geo_accidents_mn
+    GROUP BY city_id
+) counts
+WHERE ctu_accidents.id = counts.city_id;
+
+-- Cluster Footprints, Buffers of ~1-5km Around Random Points
+INSERT INTO crnt_clstr_ftprnt (geom)
+SELECT ST_Buffer(
+    ST_SetSRID(ST_MakePoint(-97.2 + random() * 7.7, 43.5 + random() * 5.9), 4326),
+    0.01 + random() * 0.04,
+    16
+)
+FROM generate_series(1, %(clusters)s);
+
+INSERT INTO clstr_ts_ftprnt (cluster_year, geom)
+SELECT y,
+ST_Buffer(
+    ST_SetSRID(ST_MakePoint(-97.2 + random() * 7.7, 43.5 + random() * 5.9), 4326),
+    0.01 + random() * 0.04,
+    16
+)
+FROM generate_series(2017, 2023) y, generate_series(1, %(clusters)s);
+
+INSERT INTO clstr_union_ftprnt (stability_count, geom)
+SELECT 1 + floor(random() * 7)::int,
+ST_Buffer(
+    ST_SetSRID(ST_MakePoint(-97.2 + random() * 7.7, 43.5 + random() * 5.9), 4326),
+    0.01 + random() * 0.04,
+    16
+)
+FROM generate_series(1, %(clusters)s);
+
+-- Weekly Time Series, as Built by the Aggregator
+INSERT INTO glb_wk_time_series (incident_count, week)
+SELECT COUNT(*) AS incident_count,
+date_trunc('week', incident_date)::date AS week
+FROM geo_accidents
+WHERE date_trunc('week', incident_date)::date > '2016-12-31'
+GROUP BY date_trunc('week', incident_date)::date;
+
+-- Metric Rollups, as Maintained by the Aggregator
+INSERT INTO metric_rollup_icrs (icr)
+SELECT icr FROM raw_accidents;
+
+INSERT INTO metric_rollups (metric, category, total)
+SELECT metric, category, COUNT(*)
+FROM (
+    SELECT 'alcohol' AS metric, alcohol AS category FROM raw_people
+    UNION ALL
+    SELECT 'seatbelt', seatbelt FROM raw_people
+    UNION ALL
+    SELECT 'helmet', helmet FROM raw_people
+    UNION ALL
+    SELECT 'condition', road_condition FROM raw_accidents
+    UNION ALL
+    SELECT 'accident-type', incident_type FROM raw_accidents
+    UNION ALL
+    SELECT 'vehicle-count', vehicles_involved::text FROM raw_accidents
+) metrics
+WHERE category IS NOT NULL
+GROUP BY metric, category;
+
+-- Version Stamps
+INSERT INTO data_version (table_name, version, updated_at)
+SELECT table_name, 1, now()
+FROM unnest(ARRAY[
+    'raw_accidents', 'raw_people', 'geo_accidents_mn', 'ctu_accidents',
+    'crnt_clstr_ftprnt', 'clstr_ts_ftprnt', 'clstr_union_ftprnt',
+    'glb_wk_time_series', 'metric_rollups'
+]) table_name;
+
+ANALYZE;
@@ -73,18 +73,18 @@ CREATE TABLE IF NOT EXISTS clstr_ts_ftprnt (
     cluster_id SERIAL PRIMARY KEY,
     cluster_year INT,
     geom GEOMETRY(GEOMETRY, 4326)
-)
+);
 
 CREATE TABLE IF NOT EXISTS clstr_union_ftprnt (
     cluster_id SERIAL PRIMARY KEY,
     stability_count INT,
     geom GEOMETRY(GEOMETRY, 4326)
-)
+);
 
 CREATE TABLE IF NOT EXISTS crnt_clstr_ftprnt (
     cluster_id SERIAL PRIMARY KEY,
     geom GEOMETRY(GEOMETRY, 4326)
-)
+);
 
 -- COPY of geo_accidents, filtered for QA/QC
 CREATE TABLE IF NOT EXISTS geo_accidents_mn (
@@ -100,3 +100,72 @@ CREATE TABLE IF NOT EXISTS geo_accidents_mn (
     geom GEOMETRY(POINT, 4326),
     city_id INT
 );
+
+-- Weekly incident counts, rebuilt by the aggregator
+CREATE TABLE IF NOT EXISTS glb_wk_time_series (
+    incident_count BIGINT,
+    week DATE
+);
+
+-- Spatial indexes for bounding box filtering in the API
+-- (rebuilt tables keep their indexes, the pipeline builds into
+-- LIKE ... INCLUDING ALL staging copies and swaps them in)
+CREATE INDEX IF NOT EXISTS geo_accidents_mn_geom_idx
+ON geo_accidents_mn USING GIST (geom);
+
+CREATE INDEX IF NOT EXISTS ctu_accidents_geom_idx
+ON ctu_accidents USING GIST (geom);
+
+-- B-tree indexes for single incident lookups & date windows in the API
+CREATE INDEX IF NOT EXISTS geo_accidents_mn_icr_idx
+ON geo_accidents_mn (icr);
+
+CREATE INDEX IF NOT EXISTS geo_accidents_mn_incident_date_idx
+ON geo_accidents_mn (incident_date);
+
+-- Version stamps bumped by the pipeline whenever a table changes,
+-- used by the API to invalidate cached responses
+CREATE TABLE IF NOT EXISTS data_version (
+    table_name TEXT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Tables created while updated_at was a TIMESTAMP held the server's local
+-- time, converted here using the session's TimeZone (a no-op once converted)
+ALTER TABLE data_version ALTER COLUMN updated_at TYPE TIMESTAMPTZ;
+
+-- Per-category metric counts maintained incrementally by the aggregator,
+-- read by the API's metrics routes instead of grouping the raw tables
+CREATE TABLE IF NOT EXISTS metric_rollups (
+    metric TEXT,
+    category TEXT,
+    total BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY(metric, category)
+);
+
+-- ICRs already counted in metric_rollups
+CREATE TABLE IF NOT EXISTS metric_rollup_icrs (
+    icr INT PRIMARY KEY
+);
+
+-- Scraper records that failed to fetch or parse, retried by later runs
+CREATE TABLE IF NOT EXISTS scrape_failures (
+    record_id INT PRIMARY KEY,
+    attempts INT NOT NULL DEFAULT 1,
+    last_error TEXT,
+    failed_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+-- DPS record IDs already scraped, so runs only fetch new incident pages
+CREATE TABLE IF NOT EXISTS scraped_records (
+    record_id INT PRIMARY KEY,
+    scraped_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+-- Last date each scraped site was searched through
+CREATE TABLE IF NOT EXISTS scrape_watermark (
+    source TEXT PRIMARY KEY,
+    searched_through DATE NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT now()
+);
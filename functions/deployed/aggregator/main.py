@@ -1,8 +1,105 @@
 import os
+import time
 
 import functions_framework
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import URL
+from sqlalchemy.exc import OperationalError
+
+
+def copy_indexes(connection, table):
+    # RECREATE THE LIVE TABLE'S KEYS & INDEXES ON {table}_staging (SKIPPING
+    # ANY IT ALREADY HAS), SO swap_table CAN HAND THEM THEIR LIVE NAMES.
+    # STAGING IS BUILT LIKE THE LIVE TABLE ORIGINALLY WAS, SO ITS COLUMN TYPES
+    # (E.G. GEOMETRY TYPE & SRID) FOLLOW THE NEW DATA, NOT THE OLD TABLE
+    live_indexes_query = """
+    SELECT li.indisunique,
+    substring(pg_get_indexdef(li.indexrelid) from ' USING .*$'),
+    pg_get_constraintdef(con.oid)
+    FROM pg_index li
+    LEFT JOIN pg_constraint con
+    ON con.conindid = li.indexrelid
+    AND con.conrelid = li.indrelid
+    AND con.contype IN ('p', 'u', 'x')
+    WHERE li.indrelid = CAST(:live AS regclass)
+    AND NOT EXISTS (
+        SELECT 1
+        FROM pg_index si
+        WHERE si.indrelid = CAST(:staging AS regclass)
+        AND si.indisunique = li.indisunique
+        AND substring(pg_get_indexdef(si.indexrelid) from ' USING .*$')
+        = substring(pg_get_indexdef(li.indexrelid) from ' USING .*$')
+    )
+    """
+
+    live_indexes = connection.execute(
+        text(live_indexes_query),
+        {"live": table, "staging": f"{table}_staging"},
+    ).fetchall()
+
+    for unique, definition, constraint in live_indexes:
+        if constraint is not None:
+            connection.execute(text(f"ALTER TABLE {table}_staging ADD {constraint}"))
+        else:
+            connection.execute(
+                text(
+                    f"CREATE {'UNIQUE ' if unique else ''}INDEX "
+                    f"ON {table}_staging{definition}"
+                )
+            )
+
+
+def swap_table(connection, table, lock_timeout="2s", attempts=5):
+    # STAGING INDEXES ARE MATCHED TO THE LIVE ONES BY DEFINITION,
+    # SO THEY CAN TAKE OVER THEIR NAMES ONCE THE LIVE TABLE IS DROPPED
+    index_pairs_query = """
+    SELECT staging.relname, live.relname
+    FROM pg_index si
+    JOIN pg_class staging ON staging.oid = si.indexrelid
+    JOIN pg_index li ON li.indrelid = CAST(:live AS regclass)
+    JOIN pg_class live ON live.oid = li.indexrelid
+    WHERE si.indrelid = CAST(:staging AS regclass)
+    AND si.indisunique = li.indisunique
+    AND substring(pg_get_indexdef(si.indexrelid) from ' USING .*$')
+    = substring(pg_get_indexdef(li.indexrelid) from ' USING .*$')
+    """
+
+    for attempt in range(attempts):
+        try:
+            # GIVE UP ON THE LOCK RATHER THAN QUEUE API READS BEHIND IT
+            connection.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+
+            index_pairs = connection.execute(
+                text(index_pairs_query),
+                {"live": table, "staging": f"{table}_staging"},
+            ).fetchall()
+
+            # RENAME IN ONE TRANSACTION, READERS SEE THE OLD OR NEW TABLE
+            connection.execute(text(f"ALTER TABLE {table} RENAME TO {table}_old"))
+            connection.execute(text(f"ALTER TABLE {table}_staging RENAME TO {table}"))
+            connection.execute(text(f"DROP TABLE {table}_old"))
+
+            renamed = set()
+
+            for staging_index, live_index in index_pairs:
+                if staging_index in renamed or live_index in renamed:
+                    continue
+
+                connection.execute(
+                    text(f"ALTER INDEX {staging_index} RENAME TO {live_index}")
+                )
+                renamed.update([staging_index, live_index])
+
+            connection.commit()
+            return
+
+        except OperationalError:
+            connection.rollback()
+
+            if attempt == attempts - 1:
+                raise
+
+            time.sleep(2**attempt)
 
 
 def update_city_id(db):
@@ -31,20 +128,44 @@ def update_city_id(db):
 
 def geocoding_qaqc_table(db):
     with db.connect() as connection:
-        # CREATE COPY OF geo_accidents W/O INVALID GC RECORDS
-        drop_query = "DROP TABLE IF EXISTS geo_accidents_mn"
-        connection.execute(text(drop_query))
-        connection.commit()
+        # BUILD COPY OF geo_accidents W/O INVALID GC RECORDS INTO A STAGING TABLE
+        connection.execute(text("DROP TABLE IF EXISTS geo_accidents_mn_staging"))
 
         copy_query = """
-        CREATE TABLE IF NOT EXISTS geo_accidents_mn AS
-        SELECT acc.*
+        CREATE TABLE geo_accidents_mn_staging AS
+        SELECT DISTINCT ON (acc.icr) acc.*
         FROM geo_accidents acc
         JOIN ctu
         ON ST_Intersects(ctu.geom, acc.geom)
+        ORDER BY acc.icr
         """
 
         connection.execute(text(copy_query))
+        copy_indexes(connection, "geo_accidents_mn")
+        connection.commit()
+
+        swap_table(connection, "geo_accidents_mn")
+
+        # INDEXES FOR BOUNDING BOX, ICR & DATE QUERIES FROM THE API
+        # (NO-OPS ONCE PRESENT, AS SWAPS KEEP THEM)
+        index_queries = [
+            """
+            CREATE INDEX IF NOT EXISTS geo_accidents_mn_geom_idx
+            ON geo_accidents_mn USING GIST (geom)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS geo_accidents_mn_icr_idx
+            ON geo_accidents_mn (icr)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS geo_accidents_mn_incident_date_idx
+            ON geo_accidents_mn (incident_date)
+            """,
+        ]
+
+        for index_query in index_queries:
+            connection.execute(text(index_query))
+
         connection.commit()
 
 
@@ -76,13 +197,11 @@ def update_ctu_incident_counts(db):
 
 def global_time_series(db):
     with db.connect() as connection:
-        # DROP EXISTING TABLE
-        drop_query = "DROP TABLE IF EXISTS glb_wk_time_series"
-        connection.execute(text(drop_query))
-        connection.commit()
+        # BUILD INTO A STAGING TABLE, THEN SWAP
+        connection.execute(text("DROP TABLE IF EXISTS glb_wk_time_series_staging"))
 
         create_query = """
-        CREATE TABLE IF NOT EXISTS glb_wk_time_series AS
+        CREATE TABLE glb_wk_time_series_staging AS
         SELECT COUNT(*) AS incident_count,
         date_trunc('week', incident_date)::date AS week
         FROM geo_accidents
@@ -91,6 +210,66 @@ def global_time_series(db):
         """
 
         connection.execute(text(create_query))
+        copy_indexes(connection, "glb_wk_time_series")
+        connection.commit()
+
+        swap_table(connection, "glb_wk_time_series")
+
+
+def update_metric_rollups(db):
+    with db.connect() as connection:
+        # COUNT ONLY ICRS NOT YET IN THE ROLLUPS, THEN MARK THEM AS COUNTED
+        rollup_query = """
+        WITH new_icrs AS (
+            INSERT INTO metric_rollup_icrs (icr)
+            SELECT icr FROM raw_accidents
+            ON CONFLICT (icr) DO NOTHING
+            RETURNING icr
+        ),
+        new_people AS (
+            SELECT p.* FROM raw_people p JOIN new_icrs USING (icr)
+        ),
+        new_accidents AS (
+            SELECT a.* FROM raw_accidents a JOIN new_icrs USING (icr)
+        )
+        INSERT INTO metric_rollups (metric, category, total)
+        SELECT metric, category, COUNT(*)
+        FROM (
+            SELECT 'alcohol' AS metric, alcohol AS category FROM new_people
+            UNION ALL
+            SELECT 'seatbelt', seatbelt FROM new_people
+            UNION ALL
+            SELECT 'helmet', helmet FROM new_people
+            UNION ALL
+            SELECT 'condition', road_condition FROM new_accidents
+            UNION ALL
+            SELECT 'accident-type', incident_type FROM new_accidents
+            UNION ALL
+            SELECT 'vehicle-count', vehicles_involved::text FROM new_accidents
+        ) new_metrics
+        WHERE category IS NOT NULL
+        GROUP BY metric, category
+        ON CONFLICT (metric, category)
+        DO UPDATE SET total = metric_rollups.total + EXCLUDED.total
+        """
+
+        connection.execute(text(rollup_query))
+        connection.commit()
+
+
+def bump_data_version(db, tables):
+    with db.connect() as connection:
+        # BUMP VERSION STAMPS USED BY THE API TO INVALIDATE CACHES
+        bump_query = """
+        INSERT INTO data_version (table_name, version, updated_at)
+        VALUES (:table_name, 1, now())
+        ON CONFLICT (table_name)
+        DO UPDATE SET version = data_version.version + 1, updated_at = now()
+        """
+
+        for table in tables:
+            connection.execute(text(bump_query), {"table_name": table})
+
         connection.commit()
 
 
@@ -115,4 +294,11 @@ def main(in_placeholder):
 
     global_time_series(db)
 
+    update_metric_rollups(db)
+
+    bump_data_version(
+        db,
+        ["geo_accidents_mn", "ctu_accidents", "glb_wk_time_series", "metric_rollups"],
+    )
+
     return "SUCCESS"
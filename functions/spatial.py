@@ -11,6 +11,7 @@ analyses on accident data.
 """
 
 import os
+import time
 
 import functions_framework
 import geopandas as gpd
@@ -22,6 +23,113 @@ from pysal.explore import esda
 from pysal.lib import weights
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import URL
+from sqlalchemy.exc import OperationalError
+
+
+def copy_indexes(connection, table):
+    # RECREATE THE LIVE TABLE'S KEYS & INDEXES ON {table}_staging (SKIPPING
+    # ANY IT ALREADY HAS), SO swap_table CAN HAND THEM THEIR LIVE NAMES.
+    # STAGING IS BUILT LIKE THE LIVE TABLE ORIGINALLY WAS, SO ITS COLUMN TYPES
+    # (E.G. GEOMETRY TYPE & SRID) FOLLOW THE NEW DATA, NOT THE OLD TABLE
+    live_indexes_query = """
+    SELECT li.indisunique,
+    substring(pg_get_indexdef(li.indexrelid) from ' USING .*$'),
+    pg_get_constraintdef(con.oid)
+    FROM pg_index li
+    LEFT JOIN pg_constraint con
+    ON con.conindid = li.indexrelid
+    AND con.conrelid = li.indrelid
+    AND con.contype IN ('p', 'u', 'x')
+    WHERE li.indrelid = CAST(:live AS regclass)
+    AND NOT EXISTS (
+        SELECT 1
+        FROM pg_index si
+        WHERE si.indrelid = CAST(:staging AS regclass)
+        AND si.indisunique = li.indisunique
+        AND substring(pg_get_indexdef(si.indexrelid) from ' USING .*$')
+        = substring(pg_get_indexdef(li.indexrelid) from ' USING .*$')
+    )
+    """
+
+    live_indexes = connection.execute(
+        text(live_indexes_query),
+        {"live": table, "staging": f"{table}_staging"},
+    ).fetchall()
+
+    for unique, definition, constraint in live_indexes:
+        if constraint is not None:
+            connection.execute(text(f"ALTER TABLE {table}_staging ADD {constraint}"))
+        else:
+            connection.execute(
+                text(
+                    f"CREATE {'UNIQUE ' if unique else ''}INDEX "
+                    f"ON {table}_staging{definition}"
+                )
+            )
+
+
+def swap_table(connection, table, lock_timeout="2s", attempts=5):
+    # STAGING INDEXES ARE MATCHED TO THE LIVE ONES BY DEFINITION,
+    # SO THEY CAN TAKE OVER THEIR NAMES ONCE THE LIVE TABLE IS DROPPED
+    index_pairs_query = """
+    SELECT staging.relname, live.relname
+    FROM pg_index si
+    JOIN pg_class staging ON staging.oid = si.indexrelid
+    JOIN pg_index li ON li.indrelid = CAST(:live AS regclass)
+    JOIN pg_class live ON live.oid = li.indexrelid
+    WHERE si.indrelid = CAST(:staging AS regclass)
+    AND si.indisunique = li.indisunique
+    AND substring(pg_get_indexdef(si.indexrelid) from ' USING .*$')
+    = substring(pg_get_indexdef(li.indexrelid) from ' USING .*$')
+    """
+
+    for attempt in range(attempts):
+        try:
+            # GIVE UP ON THE LOCK RATHER THAN QUEUE API READS BEHIND IT
+            connection.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+
+            index_pairs = connection.execute(
+                text(index_pairs_query),
+                {"live": table, "staging": f"{table}_staging"},
+            ).fetchall()
+
+            # RENAME IN ONE TRANSACTION, READERS SEE THE OLD OR NEW TABLE
+            connection.execute(text(f"ALTER TABLE {table} RENAME TO {table}_old"))
+            connection.execute(text(f"ALTER TABLE {table}_staging RENAME TO {table}"))
+            connection.execute(text(f"DROP TABLE {table}_old"))
+
+            renamed = set()
+
+            for staging_index, live_index in index_pairs:
+                if staging_index in renamed or live_index in renamed:
+                    continue
+
+                connection.execute(
+                    text(f"ALTER INDEX {staging_index} RENAME TO {live_index}")
+                )
+                renamed.update([staging_index, live_index])
+
+            connection.commit()
+            return
+
+        except OperationalError:
+            connection.rollback()
+
+            if attempt == attempts - 1:
+                raise
+
+            time.sleep(2**attempt)
+
+
+def replace_table(gdf, table, db):
+    # LOAD INTO A STAGING TABLE, INDEX IT LIKE table, THEN SWAP IT IN
+    gdf.to_postgis(f"{table}_staging", db, if_exists="replace")
+
+    with db.connect() as connection:
+        copy_indexes(connection, table)
+        connection.commit()
+
+        swap_table(connection, table)
 
 
 def run_lisa(db):
@@ -132,7 +240,7 @@ def run_monthly_adbscan(db):
 
     union_df = union_df.set_geometry("geom")
 
-    union_df.to_postgis("clstr_union_ftprnt", db, if_exists="replace")
+    replace_table(union_df, "clstr_union_ftprnt", db)
 
     # Upload TS to DB
     yearly_footprints.insert(0, "cluster_id", range(0, len(yearly_footprints)))
@@ -140,7 +248,7 @@ def run_monthly_adbscan(db):
 
     yearly_footprints = yearly_footprints.set_geometry("geom")
 
-    yearly_footprints.to_postgis("clstr_ts_ftprnt", db, if_exists="replace")
+    replace_table(yearly_footprints, "clstr_ts_ftprnt", db)
 
 
 def run_total_adbscan(db):
@@ -172,7 +280,7 @@ def run_total_adbscan(db):
 
     footprint_gdf = footprint_gdf.set_geometry("geom")
 
-    footprint_gdf.to_postgis("crnt_clstr_ftprnt", db, if_exists="replace")
+    replace_table(footprint_gdf, "crnt_clstr_ftprnt", db)
 
 
 def _count_overlapping_features(in_gdf):
@@ -235,6 +343,22 @@ def _count_overlapping_features(in_gdf):
     return new_gdf
 
 
+def bump_data_version(db, tables):
+    with db.connect() as connection:
+        # BUMP VERSION STAMPS USED BY THE API TO INVALIDATE CACHES
+        bump_query = """
+        INSERT INTO data_version (table_name, version, updated_at)
+        VALUES (:table_name, 1, now())
+        ON CONFLICT (table_name)
+        DO UPDATE SET version = data_version.version + 1, updated_at = now()
+        """
+
+        for table in tables:
+            connection.execute(text(bump_query), {"table_name": table})
+
+        connection.commit()
+
+
 @functions_framework.http
 def main():
     # Creating Database Engine Instance
@@ -256,6 +380,11 @@ def main():
 
     run_monthly_adbscan(db)
 
+    bump_data_version(
+        db,
+        ["ctu_accidents", "crnt_clstr_ftprnt", "clstr_ts_ftprnt", "clstr_union_ftprnt"],
+    )
+
 
 if __name__ == "__main__":
     main()
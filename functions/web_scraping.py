@@ -1,9 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 """
-Function to scrape and transform incidents from the past two weeks,
-identify the records not currently in the database, and load the
-new records into the database.
+Function to scrape and transform incidents posted since the last run
+(plus a lookback for late postings), skipping records already scraped,
+and load the new records into the database.
 
 @Author: Luke Zaruba
 @Date: Aug 9, 2023
@@ -13,14 +13,114 @@ new records into the database.
 import json
 import os
 import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
+from functools import lru_cache
+from typing import NamedTuple
 
 import functions_framework
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString
+from requests.adapters import HTTPAdapter
 from sqlalchemy import INTEGER, TEXT, TIMESTAMP, create_engine, text
 from sqlalchemy.engine import URL
+from urllib3.util.retry import Retry
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    from lxml.cssselect import CSSSelector
+    from lxml.html import document_fromstring
+except ImportError:
+    CSSSelector = None
+
+
+class RateLimiter:
+    def __init__(self, requests_per_second: float) -> None:
+        """Spaces out requests made from any number of threads.
+
+        Args:
+            requests_per_second (float): Maximum request rate, or 0 for no limit.
+        """
+        self.interval = 1 / requests_per_second if requests_per_second else 0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Blocks until the caller's turn to send a request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        time.sleep(slot - now)
+
+
+# (Connect, Read) Timeouts in Seconds
+REQUEST_TIMEOUT = (5, 30)
+
+
+def create_session(
+    max_connections: int = 8, retries: int = 3, backoff_factor: float = 0.5
+) -> requests.Session:
+    """Creates a session that keeps connections to the DPS site alive and
+    retries failed requests with exponential backoff.
+
+    Args:
+        max_connections (int): Size of the connection pool, one per worker.
+        retries (int): Retries on connection errors, timeouts & 429/5xx responses.
+        backoff_factor (float): Retries wait backoff_factor * 2 ** (retry - 1) seconds.
+
+    :return requests.Session: Session shared by all fetching threads.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(pool_maxsize=max_connections, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
+
+
+def fetch_page(session: requests.Session, url: str) -> str:
+    """Fetches a page, raising requests.RequestException once retries run out."""
+    r = session.get(url, timeout=REQUEST_TIMEOUT)
+    r.raise_for_status()
+
+    return r.text
+
+
+def fetch_pages(
+    session: requests.Session, urls: list, max_workers: int, limiter: RateLimiter
+) -> list:
+    """Fetches pages concurrently, at most `max_workers` at a time.
+
+    :return list: (HTML, None) or (None, error) per URL, in the same order as `urls`.
+    """
+
+    def fetch(url: str) -> tuple:
+        limiter.wait()
+
+        try:
+            return fetch_page(session, url), None
+        except requests.RequestException as e:
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(fetch, urls))
 
 
 class QueryURLs:
@@ -32,6 +132,9 @@ class QueryURLs:
         end_month: str,
         end_day: str,
         end_year: str,
+        max_workers: int = 8,
+        requests_per_second: float = 5.0,
+        session: requests.Session = None,
     ) -> None:
         """Class for identifying relevant accident records within a timeframe.
 
@@ -42,7 +145,13 @@ class QueryURLs:
             end_month (str): Month of end date for query.
             end_day (str): Day of end date for query.
             end_year (str): Year of end date for query.
+            max_workers (int): Maximum number of pages fetched at once.
+            requests_per_second (float): Maximum request rate to the DPS site.
+            session (requests.Session): Session to reuse, one is created if None.
         """
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(requests_per_second)
+        self.session = session or create_session(max_workers)
         self.start_day = start_day
         self.start_month = start_month
         self.start_year = start_year
@@ -57,24 +166,31 @@ class QueryURLs:
 
         :return list: List of accident IDs to pass as URL parameter.
         """
-        # Iteratively Request for each page in search
-        all_records = []
+        # Request Every Page in Search Concurrently
+        page_urls = [self._generate_page_url(pg) for pg in range(1, self.pages + 1)]
+
+        pages = fetch_pages(self.session, page_urls, self.max_workers, self.limiter)
 
-        for pg in range(1, self.pages + 1):
-            page_url = self._generate_page_url(pg)
+        # Collect Records in Page Order
+        all_records = []
 
-            page_records = self._find_records_from_single_page(page_url)
+        for pg, (html, error) in enumerate(pages, start=1):
+            if error is not None:
+                raise RuntimeError(
+                    f"Failed to fetch search results page {pg}"
+                ) from error
 
-            all_records += page_records
+            all_records += self._find_records_from_single_page(html)
 
         return all_records
 
     def _find_last_page(self) -> int:
         # Request
-        r = requests.get(self.base_url)
+        self.limiter.wait()
+        html = fetch_page(self.session, self.base_url)
 
         # Scrape
-        soup = BeautifulSoup(r.text, features="html.parser")
+        soup = BeautifulSoup(html, features="html.parser")
 
         last_page = soup.find("li", {"class": "PagedList-skipToLast"})
         last_page_num = int(
@@ -92,12 +208,9 @@ class QueryURLs:
         return new_url
 
     @staticmethod
-    def _find_records_from_single_page(url) -> list:
-        # Request
-        r = requests.get(url)
-
+    def _find_records_from_single_page(html: str) -> list:
         # Scrape
-        soup = BeautifulSoup(r.text, features="html.parser")
+        soup = BeautifulSoup(html, features="html.parser")
 
         numbers = []
 
@@ -109,15 +222,200 @@ class QueryURLs:
         return numbers
 
 
+# Incident Page Field -> CSS Selector
+# Multi-Class Selectors Match the Whole Class Attribute, Like BeautifulSoup's
+# find(..., {"class": "a b"}) Did
+SELECTORS = {
+    "incident_type": 'div[class="col-md-1 col-xs-7"]',
+    "icr": 'div[class="col-md-2 col-xs-2"]',
+    "date": 'div[class="col-md-2 col-xs-8"]',
+    "district": 'div[class="col-md-2 col-xs-9"]',
+    "location": 'div[class="col-md-8 col-xs-12"]',
+    "condition": 'div[class="col-md-2 col-xs-4"]',
+    "num_vehicles": "strong",
+}
+
+# Class Attribute of the Divs Describing Vehicles & People -> Field
+PERSON_CLASSES = {
+    "col-md-12 col-xs-12": "vehicle",
+    "person-role": "role",
+    "col-md-2 col-xs-6": "injury_helmet",
+    "col-md-2 col-xs-8": "seatbelt",
+    "col-md-3 col-xs-2": "alcohol",
+}
+
+
+class Person(NamedTuple):
+    person_name: str
+    vehicle: str
+    residence: str
+    person_role: str
+    injury: str
+    helmet: str
+    seatbelt: str
+    alcohol: str
+    icr: str
+    gender: str
+    age: str
+
+
+class Page(ABC):
+    """
+    Parsed incident page. Subclasses wrap one HTML parser (parsing the page
+    passed to their constructor) & return, for each element matching a CSS
+    selector, its text up to the first child element.
+    """
+
+    name = None
+
+    @staticmethod
+    def available() -> bool:
+        return True
+
+    @abstractmethod
+    def texts(self, selector: str) -> list:
+        pass
+
+    @abstractmethod
+    def elements(self, tag: str):
+        """Yields (class attribute, element) for every `tag`, in document order."""
+
+    @abstractmethod
+    def element_text(self, element) -> str:
+        pass
+
+    def text(self, selector: str, index: int = 0) -> str:
+        """Text of the `index`-th match, raising IndexError if there is none."""
+        return self.texts(selector)[index]
+
+    @staticmethod
+    def _strip(text: str) -> str:
+        return text.strip("\r\n ")
+
+
+class SelectolaxPage(Page):
+    name = "selectolax"
+
+    def __init__(self, html: str) -> None:
+        self.tree = LexborHTMLParser(html)
+
+    @staticmethod
+    def available() -> bool:
+        return LexborHTMLParser is not None
+
+    def texts(self, selector: str) -> list:
+        return [self.element_text(node) for node in self.tree.css(selector)]
+
+    def elements(self, tag: str):
+        for node in self.tree.css(tag):
+            yield node.attributes.get("class") or "", node
+
+    def element_text(self, node) -> str:
+        child = node.child
+
+        if child is None or child.tag != "-text":
+            return ""
+
+        return self._strip(child.text(deep=False))
+
+
+class LxmlPage(Page):
+    name = "lxml"
+
+    def __init__(self, html: str) -> None:
+        self.tree = document_fromstring(html)
+
+    @staticmethod
+    def available() -> bool:
+        return CSSSelector is not None
+
+    def texts(self, selector: str) -> list:
+        return [
+            self.element_text(element) for element in self._compile(selector)(self.tree)
+        ]
+
+    def elements(self, tag: str):
+        for element in self.tree.iter(tag):
+            yield element.get("class", ""), element
+
+    def element_text(self, element) -> str:
+        return self._strip(element.text or "")
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _compile(selector: str):
+        return CSSSelector(selector)
+
+
+class SoupPage(Page):
+    name = "html.parser"
+
+    def __init__(self, html: str) -> None:
+        self.soup = BeautifulSoup(html, features="html.parser")
+
+    def texts(self, selector: str) -> list:
+        return [self.element_text(tag) for tag in self.soup.select(selector)]
+
+    def elements(self, tag: str):
+        for element in self.soup.find_all(tag):
+            yield " ".join(element.get("class", [])), element
+
+    def element_text(self, tag) -> str:
+        if not tag.contents or type(tag.contents[0]) is not NavigableString:
+            return ""
+
+        return self._strip(str(tag.contents[0]))
+
+
+# Parsers, Fastest First
+PARSERS = {page.name: page for page in (SelectolaxPage, LxmlPage, SoupPage)}
+
+
+def page_parser(name: str = "auto") -> type:
+    """Returns the Page class for a parser, or the fastest installed if "auto".
+
+    Raises:
+        ValueError: If the parser is unknown or not installed.
+    """
+    if name == "auto":
+        return next(page for page in PARSERS.values() if page.available())
+
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser {name!r}, expected one of {list(PARSERS)}")
+
+    if not PARSERS[name].available():
+        raise ValueError(f"Parser {name!r} is not installed")
+
+    return PARSERS[name]
+
+
 class ScrapeRecords:
-    def __init__(self, record_list: list) -> None:
+    def __init__(
+        self,
+        record_list: list,
+        max_workers: int = 8,
+        requests_per_second: float = 5.0,
+        session: requests.Session = None,
+        parser: str = "auto",
+    ) -> None:
         """
         Class for extracting accident records based on list of unique accident IDs for URL parameter.
 
         Args:
             record_list (list): List of accident IDs to pass as URL parameter.
+            max_workers (int): Maximum number of records fetched at once.
+            requests_per_second (float): Maximum request rate to the DPS site.
+            session (requests.Session): Session to reuse, one is created if None.
+            parser (str): HTML parser, see PARSERS, or "auto" for the fastest installed.
         """
         self.record_list = record_list
+        self.max_workers = max_workers
+        self.limiter = RateLimiter(requests_per_second)
+        self.session = session or create_session(max_workers)
+        self.page_class = page_parser(parser)
+
+        # Record IDs that Could Not be Fetched or Parsed, with the Error
+        self.failed_records = {}
         self._incident_type = []
         self._incident_icr = []
         self._incident_date = []
@@ -128,19 +426,27 @@ class ScrapeRecords:
 
     def scrape(self) -> None:
         """Method for extracting relevant accident data for all records."""
-        # Create Empty List for Vehicle DFs
-        vehicle_df_list = []
+        # Create Empty List for People Involved
+        people = []
 
-        # Loop through Record IDs
-        for record_id in self.record_list:
-            try:
-                url = f"https://app.dps.mn.gov/MSPMedia2/IncidentDisplay/{record_id}"
+        # Fetch Records Concurrently
+        urls = [
+            f"https://app.dps.mn.gov/MSPMedia2/IncidentDisplay/{record_id}"
+            for record_id in self.record_list
+        ]
+
+        pages = fetch_pages(self.session, urls, self.max_workers, self.limiter)
 
-                soup = self._scrape_single_record(url)
+        # Parse in Record Order, so Results Don't Depend on Fetch Timing
+        for record_id, (html, error) in zip(self.record_list, pages):
+            if error is not None:
+                self.failed_records[record_id] = repr(error)
+                continue
 
-                vehicle_df_list.append(self._get_vehicle_data(soup))
-            except:
-                pass
+            try:
+                people += self.parse(html)
+            except Exception as e:
+                self.failed_records[record_id] = repr(e)
 
         # Convert to DF
         self.scraped_accident_df = pd.DataFrame(
@@ -179,191 +485,273 @@ class ScrapeRecords:
         ].apply(lambda n: int(n.split(" ")[0]) if n.split(" ")[0].isdigit() else 999)
 
         # Vehicles DF
-        try:
-            self.scraped_vehicles_df = pd.concat(vehicle_df_list).reset_index()
-
-            self.scraped_vehicles_df[["gender", "age"]] = self.scraped_vehicles_df.iloc[
-                :, 3
-            ].str.split(" Age: ", expand=True)
+        self.scraped_vehicles_df = pd.DataFrame(people, columns=Person._fields)
 
-            self.scraped_vehicles_df = self.scraped_vehicles_df.drop(
-                self.scraped_vehicles_df.columns[3], axis=1
-            )
+    def parse(self, html: str) -> list:
+        """Method for extracting accident & vehicle data from one incident page.
 
-            self.scraped_vehicles_df.columns = [
-                "person_name",
-                "vehicle",
-                "residence",
-                "person_role",
-                "injury",
-                "helmet",
-                "seatbelt",
-                "alcohol",
-                "icr",
-                "gender",
-                "age",
-            ]
-
-        except:
-            print("Vehicles DF is empty.")
+        :return list: Person records for the people involved.
+        """
+        page = self._scrape_single_record(html)
 
-    def _scrape_single_record(self, url: str) -> None:
-        r = requests.get(url)
+        return self._get_vehicle_data(page)
 
-        soup = BeautifulSoup(r.text, features="html.parser")
+    def _scrape_single_record(self, html: str) -> Page:
+        page = self.page_class(html)
 
         # Get Data
-        incident_type_soup = str(soup.find("div", {"class": "col-md-1 col-xs-7"}))
-        incident_icr_soup = str(soup.find("div", {"class": "col-md-2 col-xs-2"}))
-        incident_date_soup = str(soup.find("div", {"class": "col-md-2 col-xs-8"}))
-        incident_district_soup = str(soup.find("div", {"class": "col-md-2 col-xs-9"}))
-        incident_location_soup = str(soup.find("div", {"class": "col-md-8 col-xs-12"}))
-        incident_condition_soup = str(
-            soup.findAll("div", {"class": "col-md-2 col-xs-4"})[1]
-        )
+        incident_type = page.text(SELECTORS["incident_type"])
+        incident_icr = page.text(SELECTORS["icr"])
+        incident_date = page.text(SELECTORS["date"])
+        incident_district = page.text(SELECTORS["district"])
+        incident_location = page.text(SELECTORS["location"])
+        incident_condition = page.text(SELECTORS["condition"], 1)
         try:
-            incident_num_vehicles_soup = str(soup.findAll("strong")[1])
-        except:
-            incident_num_vehicles_soup = ">Unknown<"
+            incident_num_vehicles = page.text(SELECTORS["num_vehicles"], 1)
+        except IndexError:
+            incident_num_vehicles = "Unknown"
 
         # Append Data
-        self._incident_type.append(self._format_string(incident_type_soup))
-        self._incident_icr.append(self._format_string(incident_icr_soup))
-        self._incident_date.append(self._format_string(incident_date_soup))
-        self._incident_district.append(self._format_string(incident_district_soup))
-        self._incident_location.append(self._format_string(incident_location_soup))
-        self._incident_condition.append(self._format_string(incident_condition_soup))
-        self._incident_num_vehicles.append(
-            self._format_string(incident_num_vehicles_soup)
-        )
+        self._incident_type.append(incident_type)
+        self._incident_icr.append(incident_icr)
+        self._incident_date.append(incident_date)
+        self._incident_district.append(incident_district)
+        self._incident_location.append(incident_location)
+        self._incident_condition.append(incident_condition)
+        self._incident_num_vehicles.append(incident_num_vehicles)
 
-        return soup
+        return page
 
-    @staticmethod
-    def _format_string(text: str) -> str:
-        formatted = text.split(">")[1].split("<")[0].strip("\r\n ")
+    def _get_vehicle_data(self, page: Page) -> list:
+        """Method for extracting the people involved in one pass over the page.
 
-        return formatted
+        Each vehicle's line (starting with its number) is followed by a name,
+        residence and "<Gender> Age: <Age>" line per person in it. Roles,
+        injuries & helmets, seat belts and alcohol are listed separately, in
+        the same order as the people.
 
-    def _get_vehicle_data(self, soup: str) -> list:
-        raw_str = ""
-        my_test_dict = dict()
-        names = dict()
+        :return list: Person records, empty if the page doesn't fit this layout.
+        """
+        vehicle = None
+        lines = []
+        people = []
+        details = {
+            "role": [],
+            "injury": [],
+            "helmet": [],
+            "seatbelt": [],
+            "alcohol": [],
+        }
 
-        airbags = []
-        roles = []
-        injuries_and_helmets = []
-        seatbelts = []
-        alc = []
+        for class_attr, element in page.elements("div"):
+            field = PERSON_CLASSES.get(class_attr)
 
-        # Gets all of the data into a single string, sep by \n
-        for v in soup.findAll("div", {"class": "col-md-12 col-xs-12"}):
-            line = self._format_string(str(v))
-            if len(line) > 1:
-                raw_str += line + "\n"
+            if field is None:
+                if "person-role" not in class_attr.split():
+                    continue
 
-        # Split Attrs by Line
-        split_info = raw_str.split("\n")
+                field = "role"
 
-        # Loop through Attrs
-        try:
-            for i in range(len(split_info) - 1):
-                # If First Char is Num --> this line is a vehicle
-                if split_info[i][0].isdigit():
-                    # Add as new key in dict
-                    my_test_dict[split_info[i]] = []
-                # If First Char is NOT Num --> this line is an attr
-                else:
-                    # Add this line to the val list of the most recent key that was added
-                    # Are dicts ordered now in python? Check this -- used to not be
-                    my_test_dict[list(my_test_dict.keys())[-1]].append(split_info[i])
-        except:
-            return
+            text = page.element_text(element)
 
-        # CHECKING VALIDITY OF PAGE
-        for i in list(my_test_dict.values()):
-            if len(i) % 3 != 0:
-                return
-
-        # Loop through Vehs
-        for i in list(my_test_dict.values()):
-            # Loop through All Vals of Veh -- only getting person names
-            for j in range(0, len(i), 3):
-                # Person as key -- car, hometown, gender/age as vals
-                names[i[j]] = [
-                    list(my_test_dict.keys())[list(my_test_dict.values()).index(i)],
-                    i[j + 1],
-                    i[j + 2],
-                ]
-
-        # Airbags
-        for veh in soup.findAll("div", {"class": "col-md-1 col-xs-2"}):
-            if len(veh) > 1:
-                airbags.append(self._format_string(str(veh)))
-
-        # Role
-        for role in soup.findAll("div", {"class": "person-role"}):
-            roles.append(self._format_string(str(role)))
-
-        # Injury
-        for ih in soup.findAll("div", {"class": "col-md-2 col-xs-6"}):
-            x = self._format_string(str(ih))
-            if len(x) > 1:
-                injuries_and_helmets.append(x)
-
-        injuries = [
-            injuries_and_helmets[i]
-            for i in range(len(injuries_and_helmets))
-            if i % 2 == 0
-        ]
-        helmets = [
-            injuries_and_helmets[i]
-            for i in range(len(injuries_and_helmets))
-            if i % 2 != 0
-        ]
+            if field == "vehicle":
+                if len(text) <= 1:
+                    continue
+
+                for line in text.split("\n"):
+                    # Vehicle Line, Once the Previous Vehicle's People are Complete
+                    if line[:1].isdigit():
+                        if lines:
+                            return []
+
+                        vehicle = line
+
+                    # Name, Residence or Gender & Age of a Person in the Vehicle
+                    elif line and vehicle is not None:
+                        lines.append(line)
 
-        # Seat Belt
-        for sb in soup.findAll("div", {"class": "col-md-2 col-xs-8"}):
-            t = self._format_string(str(sb))
-            if len(t) > 1:
-                if not t[0].isdigit():
-                    seatbelts.append(t)
+                        if len(lines) == 3:
+                            people.append((lines[0], vehicle, lines[1], lines[2]))
+                            lines = []
 
-        # Alcohol
-        for a in soup.findAll("div", {"class": "col-md-3 col-xs-2"}):
-            alc.append(self._format_string(str(a)))
+                    else:
+                        return []
+
+            elif field == "injury_helmet":
+                if len(text) > 1:
+                    # Alternates Between a Person's Injury & Helmet
+                    if len(details["injury"]) == len(details["helmet"]):
+                        details["injury"].append(text)
+                    else:
+                        details["helmet"].append(text)
+
+            elif field == "seatbelt":
+                # Shares its Class with the Incident Date
+                if len(text) > 1 and not text[0].isdigit():
+                    details["seatbelt"].append(text)
+
+            else:
+                details[field].append(text)
+
+        # CHECKING VALIDITY OF PAGE
+        if lines or len({person[0] for person in people}) != len(people):
+            return []
+
+        if any(len(values) != len(people) for values in details.values()):
+            return []
 
         # ICR for Joining
-        icr = self._format_string(str(soup.find("div", {"class": "col-md-2 col-xs-2"})))
+        icr = self._incident_icr[-1]
 
-        # To DF
-        try:
-            ppl_df = pd.DataFrame.from_dict(names, orient="index")
+        records = []
+
+        for (name, vehicle, residence, gender_age), *person_details in zip(
+            people, *details.values()
+        ):
+            gender, _, age = gender_age.partition(" Age: ")
+
+            records.append(
+                Person(name, vehicle, residence, *person_details, icr, gender, age)
+            )
+
+        return records
 
-            ppl_df["role"] = roles
-            ppl_df["injuries"] = injuries
-            ppl_df["helmets"] = helmets
-            ppl_df["seatbelts"] = seatbelts
-            ppl_df["alc"] = alc
-            ppl_df["icr"] = icr
 
-            return ppl_df
+def database_url() -> URL:
+    return URL.create(
+        drivername="postgresql",
+        username=os.environ["DB_USER"],
+        password=os.environ["DB_PASSWORD"],
+        host=os.environ["DB_HOST"],
+        port=os.environ["DB_PORT"],
+        database=os.environ["DB_NAME"],
+    )
 
-        except:
-            return
+
+class FailedRecords:
+    def __init__(self, db, max_attempts: int = 5) -> None:
+        """Class for keeping track of records that failed to scrape, so later
+        runs can retry them.
+
+        Args:
+            db (Engine): Database engine.
+            max_attempts (int): Attempts before a record is no longer retried.
+        """
+        self.db = db
+        self.max_attempts = max_attempts
+
+    def pending(self) -> list:
+        """Method for retrieving records due for another attempt.
+
+        :return list: Record IDs, oldest failure first.
+        """
+        query = """
+        SELECT record_id
+        FROM scrape_failures
+        WHERE attempts < :max_attempts
+        ORDER BY failed_at
+        """
+
+        with self.db.connect() as connection:
+            rows = connection.execute(
+                text(query), {"max_attempts": self.max_attempts}
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def record(self, failures: dict) -> None:
+        """Method for recording failed records & their errors."""
+        query = """
+        INSERT INTO scrape_failures (record_id, attempts, last_error, failed_at)
+        VALUES (:record_id, 1, :error, now())
+        ON CONFLICT (record_id)
+        DO UPDATE SET attempts = scrape_failures.attempts + 1,
+        last_error = EXCLUDED.last_error, failed_at = now()
+        """
+
+        with self.db.connect() as connection:
+            for record_id, error in failures.items():
+                connection.execute(
+                    text(query), {"record_id": int(record_id), "error": error}
+                )
+
+            connection.commit()
+
+    def resolve(self, record_ids: list) -> None:
+        """Method for clearing records that have now been scraped."""
+        query = "DELETE FROM scrape_failures WHERE record_id = ANY(:record_ids)"
+
+        with self.db.connect() as connection:
+            connection.execute(
+                text(query), {"record_ids": [int(i) for i in record_ids]}
+            )
+            connection.commit()
+
+
+class ScrapedRecords:
+    def __init__(self, db, source: str = "dps") -> None:
+        """Class for keeping track of the records already scraped & how far
+        back searches have been completed, so runs only fetch new pages.
+
+        Args:
+            db (Engine): Database engine.
+            source (str): Name of the site in scrape_watermark.
+        """
+        self.db = db
+        self.source = source
+
+    def watermark(self) -> date:
+        """Method for retrieving the last date searched through, or None."""
+        query = "SELECT searched_through FROM scrape_watermark WHERE source = :source"
+
+        with self.db.connect() as connection:
+            return connection.execute(text(query), {"source": self.source}).scalar()
+
+    def known(self, record_ids: list) -> set:
+        """Method for finding which of the record IDs have been scraped before."""
+        query = (
+            "SELECT record_id FROM scraped_records WHERE record_id = ANY(:record_ids)"
+        )
+
+        with self.db.connect() as connection:
+            rows = connection.execute(
+                text(query), {"record_ids": [int(i) for i in record_ids]}
+            ).fetchall()
+
+        return {row[0] for row in rows}
+
+    def mark(self, record_ids: list, searched_through: date) -> None:
+        """Method for recording scraped records & advancing the watermark."""
+        record_query = """
+        INSERT INTO scraped_records (record_id)
+        SELECT unnest(CAST(:record_ids AS INT[]))
+        ON CONFLICT (record_id) DO NOTHING
+        """
+
+        watermark_query = """
+        INSERT INTO scrape_watermark (source, searched_through, updated_at)
+        VALUES (:source, :searched_through, now())
+        ON CONFLICT (source)
+        DO UPDATE SET searched_through = GREATEST(
+            scrape_watermark.searched_through, EXCLUDED.searched_through
+        ), updated_at = now()
+        """
+
+        with self.db.connect() as connection:
+            connection.execute(
+                text(record_query), {"record_ids": [int(i) for i in record_ids]}
+            )
+            connection.execute(
+                text(watermark_query),
+                {"source": self.source, "searched_through": searched_through},
+            )
+            connection.commit()
 
 
 class Loader:
     def __init__(self, icr_list, accident_df, vehicle_df):
         self._incoming_icr_ints = [int(i) for i in icr_list]
-        self.db_url = URL.create(
-            drivername="postgresql",
-            username=os.environ["DB_USER"],
-            password=os.environ["DB_PASSWORD"],
-            host=os.environ["DB_HOST"],
-            port=os.environ["DB_PORT"],
-            database=os.environ["DB_NAME"],
-        )
+        self.db_url = database_url()
         self.db = create_engine(self.db_url)
 
         self.existing_icr = self._get_current_icr()
@@ -489,27 +877,49 @@ class Loader:
             },
         )
 
+    def _bump_data_version(self, tables):
+        # Bump Version Stamps Used by the API to Invalidate Caches
+        bump_query = """
+        INSERT INTO data_version (table_name, version, updated_at)
+        VALUES (:table_name, 1, now())
+        ON CONFLICT (table_name)
+        DO UPDATE SET version = data_version.version + 1, updated_at = now()
+        """
+
+        with self.db.connect() as connection:
+            for table in tables:
+                connection.execute(text(bump_query), {"table_name": table})
+
+            connection.commit()
+
     def load(self):
         if not len(self.new_icr) == 0:
             self._load_vehicles()
             self._load_accidents()
+            self._bump_data_version(["raw_people", "raw_accidents"])
 
         return self.new_icr
 
 
 @functions_framework.http
 def main(manual=False):
+    db = create_engine(database_url())
+    scraped = ScrapedRecords(db)
+
+    # Days Searched Again Before the Watermark, for Incidents Posted Late
+    lookback = timedelta(days=int(os.environ.get("SCRAPER_LOOKBACK_DAYS", 14)))
+
     if manual:
         start_day = "01"
         end_day = "19"
         start_month = "07"
         end_month = "08"
         start_year = end_year = "2023"
+        today = date(2023, 8, 19)
 
     else:
         today = date.today()
-        delta = timedelta(weeks=2)
-        start_date = today - delta
+        start_date = (scraped.watermark() or today) - lookback
 
         start_year, start_month, start_day = (
             str(start_date).split("-")[0],
@@ -523,13 +933,52 @@ def main(manual=False):
             str(today).split("-")[2],
         )
 
-    query = QueryURLs(start_month, start_day, start_year, end_month, end_day, end_year)
+    # Concurrency & Politeness Settings for the DPS Site
+    max_workers = int(os.environ.get("SCRAPER_MAX_WORKERS", 8))
+    requests_per_second = float(os.environ.get("SCRAPER_REQUESTS_PER_SECOND", 5))
+
+    # One Session (& Connection Pool) for Every Request to the DPS Site
+    session = create_session(max_workers)
+
+    query = QueryURLs(
+        start_month,
+        start_day,
+        start_year,
+        end_month,
+        end_day,
+        end_year,
+        max_workers=max_workers,
+        requests_per_second=requests_per_second,
+        session=session,
+    )
     record_urls = query.search()
 
-    scraper = ScrapeRecords(record_urls)
+    # Only Fetch Records Not Scraped by an Earlier Run
+    known = scraped.known(record_urls)
+    new_records = [i for i in record_urls if i not in known]
+
+    # Retry Records that Failed in Earlier Runs
+    failures = FailedRecords(db)
+    searched = set(new_records)
+    retries = [i for i in failures.pending() if i not in searched]
+
+    scraper = ScrapeRecords(
+        new_records + retries,
+        max_workers=max_workers,
+        requests_per_second=requests_per_second,
+        session=session,
+        parser=os.environ.get("SCRAPER_PARSER", "auto"),
+    )
 
     scraper.scrape()
 
+    scraped_records = [
+        i for i in scraper.record_list if i not in scraper.failed_records
+    ]
+
+    failures.record(scraper.failed_records)
+    failures.resolve(scraped_records)
+
     incident_results = scraper.scraped_accident_df
     vehicle_results = scraper.scraped_vehicles_df
     icr_list = list(set(scraper.scraped_accident_df["icr"]))
@@ -538,6 +987,8 @@ def main(manual=False):
 
     load_results = loader.load()
 
+    scraped.mark(scraped_records, today)
+
     print(json.dumps({"icr": load_results}))
     return json.dumps({"icr": load_results})
 